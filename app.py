@@ -1,19 +1,22 @@
 import streamlit as st
+from ccr.perf import rerun, span
 from ccr.state import init_state
 from ccr.ui import inject_css, header, stepper, page_campaign_info, page_evaluation, page_results, footer
 
 st.set_page_config(page_title="Culturally Creative & Relevant Rater", page_icon="🧪", layout="wide")
 
-init_state()
-inject_css()
-header()
-stepper()
+with rerun("app"):
+    with span("init_state"): init_state()
+    with span("inject_css"): inject_css()
+    with span("header"): header()
+    with span("stepper"): stepper()
 
-if st.session_state.step == "Campaign Information":
-    page_campaign_info()
-elif st.session_state.step == "Evaluation":
-    page_evaluation()
-else:
-    page_results()
+    with span(f"page:{st.session_state.step}"):
+        if st.session_state.step == "Campaign Information":
+            page_campaign_info()
+        elif st.session_state.step == "Evaluation":
+            page_evaluation()
+        else:
+            page_results()
 
-footer()
+    with span("footer"): footer()
@@ -0,0 +1,160 @@
+import argparse, os, sys
+from .core import WEIGHTS_JSON, get_weights, load_weights
+from .storage import BACKENDS, make_store, migrate
+
+def cmd_migrate(args):
+    src = make_store(args.src, args.src_path)
+    dst = make_store(args.to, args.dst_path)
+    n = migrate(src, dst, chunksize=args.chunksize)
+    if args.to == "parquet":
+        dst.compact()
+    print(f"migrated {n} rows: {src.name}:{src.path} -> {dst.name}:{dst.path}")
+
+def cmd_score(args):
+    from .batch import score_file
+    weights = load_weights(args.weights, strict=True) if args.weights else dict(get_weights())
+    score_file(args.input, args.output, weights, workers=args.workers, chunksize=args.chunksize)
+
+def _pairs(items, what):
+    out = {}
+    for item in items or ():
+        k, sep, v = item.partition("=")
+        if not sep:
+            raise SystemExit(f"{what} expects COLUMN=VALUE, got {item!r}")
+        out[k.strip()] = v.strip()
+    return out
+
+def cmd_import(args):
+    from . import results
+    from .data_io import RESULTS_DB
+    from .importer import import_files
+    store = make_store(args.backend or os.environ.get("CCR_STORAGE", "csv"), args.path) if args.backend or args.path else None
+    report = import_files(args.files, store, chunksize=args.chunksize, mapping=_pairs(args.map, "--map"),
+                          defaults=_pairs(args.default, "--default"), dry_run=args.dry_run)
+    print(f"{report['imported']:,} of {report['rows_read']:,} rows imported, {report['duplicates']:,} duplicates skipped, "
+          f"{report['invalid']:,} without campaign_id" + (" (dry run)" if args.dry_run else ""))
+    for c, n in report["defaulted"].items():
+        print(f"  {c}: {n:,} rows defaulted")
+    if report["imported"] and not args.dry_run and store is None:  # other stores: rebuilt when next read
+        df = results.rebuild(RESULTS_DB)
+        print(f"rebuilt {RESULTS_DB}: {len(df):,} campaigns")
+
+def cmd_bench(args):
+    from . import bench
+    sizes = [bench.parse_size(s) for s in args.sizes.split(",")] if args.sizes else None
+    result = bench.run(sizes)
+    if args.out:
+        bench.save(result, args.out)
+    regressions = bench.compare(result, bench.load(args.baseline), args.tolerance) if args.baseline else []
+    for r in regressions:
+        print(f"REGRESSION rows={r['rows']:,} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({r['worse_by']:+.0%})")
+    if regressions:
+        return 1
+    if args.baseline:
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+def cmd_results(args):
+    from . import results
+    from .data_io import RESULTS_DB
+    if args.action == "rebuild":
+        df = results.rebuild(RESULTS_DB)
+        print(f"rebuilt {RESULTS_DB}: {len(df):,} campaigns")
+        return
+    problems = results.check(RESULTS_DB)
+    for p in problems:
+        print(p)
+    print(f"{RESULTS_DB}: " + (f"{len(problems)} inconsistencies" if problems else "consistent with the ratings"))
+    return 1 if problems else 0
+
+def cmd_serve(args):
+    import asyncio
+    from .service import serve
+    try:
+        asyncio.run(serve(args.host, args.port, args.weights, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+def cmd_loadtest(args):
+    import asyncio, json
+    from .loadtest import run
+    report = asyncio.run(run(args.url, args.connections, args.requests, args.batch))
+    print(json.dumps(report, indent=2) if args.json else
+          f"{report['requests']:,} x {report['endpoint']} over {report['connections']} connections in {report['seconds']:.2f}s: "
+          f"{report['requests_per_sec']:,.0f} req/s ({report['records_per_sec']:,.0f} records/s), "
+          f"p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms")
+
+def cmd_bootstrap(args):
+    import json
+    from .bootstrap import bootstrap_campaigns
+    from .data_io import load_ratings
+    table, summary = bootstrap_campaigns(load_ratings(), n_boot=args.n_boot, alpha=args.alpha, seed=args.seed,
+                                         workers=args.workers, top_k=args.top_k)
+    if args.out:
+        table.to_csv(args.out, index=False)
+    else:
+        print(table.head(args.top_k).to_string(index=False))
+    print(json.dumps(summary, indent=2))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m ccr")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("migrate", help="copy all ratings from one storage backend to another")
+    m.add_argument("--from", dest="src", choices=list(BACKENDS), default="csv")
+    m.add_argument("--to", choices=list(BACKENDS), required=True)
+    m.add_argument("--src-path", default=None)
+    m.add_argument("--dst-path", default=None)
+    m.add_argument("--chunksize", type=int, default=100_000)
+    m.set_defaults(func=cmd_migrate)
+    s = sub.add_parser("score", help="score a ratings CSV offline, streaming it in chunks across a process pool")
+    s.add_argument("input")
+    s.add_argument("output")
+    s.add_argument("--weights", default=None, help=f"alternate weights JSON (default: {WEIGHTS_JSON})")
+    s.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    s.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default: %(default)s)")
+    s.set_defaults(func=cmd_score)
+    r = sub.add_parser("results", help="rebuild or verify the per-campaign results table")
+    r.add_argument("action", choices=["rebuild", "check"])
+    r.set_defaults(func=cmd_results)
+    t = sub.add_parser("bootstrap", help="bootstrap confidence intervals and rank stability for campaign CCR")
+    t.add_argument("--n-boot", type=int, default=1000)
+    t.add_argument("--alpha", type=float, default=0.05, help="1 - confidence level (default: %(default)s)")
+    t.add_argument("--seed", type=int, default=0)
+    t.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    t.add_argument("--top-k", type=int, default=20, help="leaderboard size for P(top k)")
+    t.add_argument("--out", default=None, help="write the per-campaign table as CSV")
+    t.set_defaults(func=cmd_bootstrap)
+    v = sub.add_parser("serve", help="run the HTTP scoring service")
+    v.add_argument("--host", default="127.0.0.1")
+    v.add_argument("--port", type=int, default=8765)
+    v.add_argument("--weights", default=None, help=f"weights JSON, re-read when it changes (default: {WEIGHTS_JSON})")
+    v.add_argument("--max-batch", type=int, default=256, help="max single-score requests per micro-batch")
+    v.add_argument("--max-wait-ms", type=float, default=2.0, help="how long a micro-batch waits to fill up")
+    v.set_defaults(func=cmd_serve)
+    l = sub.add_parser("loadtest", help="load-test a running scoring service")
+    l.add_argument("--url", default="http://127.0.0.1:8765")
+    l.add_argument("--connections", type=int, default=32)
+    l.add_argument("--requests", type=int, default=10_000)
+    l.add_argument("--batch", type=int, default=0, help="records per request on /score/batch (0: single /score)")
+    l.add_argument("--json", action="store_true", help="print the report as JSON")
+    l.set_defaults(func=cmd_loadtest)
+    i = sub.add_parser("import", help="stream rating files in older/partner layouts into the ratings store, skipping duplicates")
+    i.add_argument("files", nargs="+")
+    i.add_argument("--backend", choices=list(BACKENDS), default=None, help="target store (default: $CCR_STORAGE or csv)")
+    i.add_argument("--path", default=None, help="target store path")
+    i.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default: %(default)s)")
+    i.add_argument("--map", action="append", metavar="SOURCE=COLUMN", help="map a source column onto a rating column")
+    i.add_argument("--default", action="append", metavar="COLUMN=VALUE",
+                   help="fill value for a missing or empty column (scores default to 3, flags to 0), e.g. rater_id=legacy")
+    i.add_argument("--dry-run", action="store_true", help="report what would be imported without writing")
+    i.set_defaults(func=cmd_import)
+    b = sub.add_parser("bench", help="benchmark scoring and data I/O on synthetic datasets")
+    b.add_argument("--sizes", default=None, help="comma separated row counts, e.g. 1k,10k,100k,1m,10m (default: 1k,10k,100k)")
+    b.add_argument("--out", default=None, help="write results as JSON")
+    b.add_argument("--baseline", default=None, help="compare against a previous --out JSON and exit 1 on regressions")
+    b.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (default: %(default)s)")
+    b.set_defaults(func=cmd_bench)
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,36 +1,15 @@
-import json, os
 import numpy as np
 import pandas as pd
+from .core import (BASE_WEIGHTS, DATA_DIR, DIMENSIONS, FLAG_COLS, SCORE_STEPS, SENTIMENT_STEPS, WEIGHTS_JSON,
+                   CompiledScorer, _concave, _normalize_weights, _risk_penalty, _risk_penalty_batch, _timeliness_boost,
+                   _to_0_100, compiled_scorer, compute_ccr_array, compute_ccr_single, get_weights, live_ccr_preview,
+                   load_weights, score_arrays)
 
-DATA_DIR = "data"
-WEIGHTS_JSON = os.path.join(DATA_DIR, "CCR_default_weights.json")
-
-DEFAULT_WEIGHTS = {
-    "CR_cultural_resonance": 0.18,
-    "OR_originality": 0.12,
-    "TI_timeliness": 0.10,
-    "IE_inclusivity_ethics": 0.08,
-    "SH_shareability": 0.10,
-    "BF_brand_channel_fit": 0.08,
-    "CQ_craft_quality": 0.08,
-    "AU_authenticity_voice": 0.06,
-    "EM_emotional_impact": 0.06,
-    "NA_narrative_strength": 0.05,
-    "PN_platform_nativeness": 0.05,
-    "CC_cultural_contribution": 0.04,
-}
-if os.path.exists(WEIGHTS_JSON):
-    try:
-        with open(WEIGHTS_JSON, "r", encoding="utf-8") as f:
-            w = json.load(f)
-            for k, v in w.items():
-                if k in DEFAULT_WEIGHTS:
-                    DEFAULT_WEIGHTS[k] = float(v)
-    except Exception:
-        pass
-
-DIMENSIONS = list(DEFAULT_WEIGHTS.keys())
-FLAG_COLS = ["flag_stereotype","flag_misappropriation","flag_sensitive_timing","flag_other_risk","neg_sentiment_ratio_estimate"]
+def __getattr__(name):
+    # DEFAULT_WEIGHTS is resolved lazily so importing this module does no file I/O
+    if name == "DEFAULT_WEIGHTS":
+        return get_weights()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 LABELS = {
     "CR_cultural_resonance": ("Cultural Resonance","How well the campaign taps into the audience’s cultural context, language, and symbols."),
@@ -47,36 +26,30 @@ LABELS = {
     "CC_cultural_contribution": ("Cultural Contribution","Adds new cultural meaning—a phrase, visual code, or behavior."),
 }
 
-def _to_0_100(x):
-    return (pd.to_numeric(x, errors="coerce") - 1.0)/4.0*100.0
-
-def _concave(x100, gamma=0.85):
-    x01 = np.clip(x100/100.0, 0, 1)
-    y01 = np.power(x01, gamma)
-    return 100.0 * y01
-
-def _risk_penalty(flags):
-    f = int(flags.get("flag_stereotype", 0)) + int(flags.get("flag_misappropriation", 0)) + int(flags.get("flag_sensitive_timing", 0)) + int(flags.get("flag_other_risk", 0))
-    p = -3.0 * f
-    if f >= 2: p += -4.0
-    p += -12.0 * float(flags.get("neg_sentiment_ratio_estimate", 0.0))
-    return p
-
-def _timeliness_boost(ti100):
-    return 0.98 + 0.08 * (ti100/100.0)
-
-def _normalize_weights(w: dict) -> dict:
-    s = sum(max(0.0, float(v)) for v in w.values()) or 1.0
-    return {k: max(0.0, float(v))/s for k,v in w.items()}
-
-def compute_ccr_single(scores_1to5: dict, weights: dict, flags: dict) -> float:
-    w_norm = _normalize_weights(weights)
-    scaled = {d: _concave(_to_0_100(scores_1to5.get(d, 3.0))) for d in DIMENSIONS}
-    core = sum(w_norm[d]*scaled[d] for d in DIMENSIONS)
-    ti100_raw = _to_0_100(scores_1to5.get("TI_timeliness", 3.0))
-    core *= _timeliness_boost(ti100_raw)
-    out = core + _risk_penalty(flags)
-    return float(np.clip(out, 0.0, 100.0))
-
-def live_ccr_preview(scores: dict, flags: dict) -> float:
-    return compute_ccr_single(scores, DEFAULT_WEIGHTS, flags)
+def _score_matrix(scores) -> np.ndarray:
+    if isinstance(scores, pd.DataFrame):
+        cols = [pd.to_numeric(scores[d], errors="coerce") if d in scores.columns else pd.Series(3.0, index=scores.index) for d in DIMENSIONS]
+        return np.column_stack([c.to_numpy(dtype=float, na_value=np.nan) for c in cols]) if cols else np.empty((len(scores), 0))
+    return np.asarray(scores, dtype=float).reshape(-1, len(DIMENSIONS))
+
+def _flag_matrix(flags, n: int) -> np.ndarray:
+    if flags is None:
+        return np.zeros((n, len(FLAG_COLS)))
+    if isinstance(flags, pd.DataFrame):
+        cols = [pd.to_numeric(flags[c], errors="coerce").fillna(0) if c in flags.columns else pd.Series(0.0, index=flags.index) for c in FLAG_COLS]
+        return np.column_stack([c.to_numpy(dtype=float) for c in cols])
+    return np.asarray(flags, dtype=float).reshape(-1, len(FLAG_COLS))
+
+def compute_ccr_batch(scores, weights: dict, flags=None) -> np.ndarray:
+    # scores: DataFrame with DIMENSIONS columns or (N x 12) array; flags: DataFrame or (N x 5) array,
+    # defaulting to the FLAG_COLS of `scores`. Bit-identical to compute_ccr_single row by row.
+    if flags is None and isinstance(scores, pd.DataFrame):
+        flags = scores
+    sm = _score_matrix(scores)
+    return compute_ccr_array(sm, weights, _flag_matrix(flags, len(sm)))
+
+def score_components(scores, flags=None):
+    if flags is None and isinstance(scores, pd.DataFrame):
+        flags = scores
+    sm = _score_matrix(scores)
+    return score_arrays(sm, _flag_matrix(flags, len(sm)))
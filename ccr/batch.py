@@ -0,0 +1,51 @@
+import os, sys, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from .algorithm import compute_ccr_batch
+
+SCORE_COL = "CCR"
+
+def _score_chunk(chunk: pd.DataFrame, weights: dict) -> bytes:
+    chunk[SCORE_COL] = compute_ccr_batch(chunk, weights)
+    return chunk.to_csv(index=False, header=False).encode("utf-8")
+
+def score_file(src, dst, weights: dict, workers: int = None, chunksize: int = 50_000, log=sys.stderr) -> dict:
+    # Streams `src` in fixed-size chunks, scores them on a process pool and writes them to `dst` in input
+    # order. At most 2 chunks per worker are in flight, so memory stays bounded whatever the file size.
+    workers = workers or os.cpu_count() or 1
+    # read as text so every input column is written back exactly as it came in
+    reader = pd.read_csv(src, chunksize=chunksize, dtype=str, keep_default_na=False)
+    t0, rows, header = time.perf_counter(), 0, False
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    pending = deque()
+    with open(dst, "wb") as out:
+        def emit(n, data):
+            nonlocal rows
+            out.write(data); rows += n
+            if log: log.write(f"\r{rows:,} rows  {rows/(time.perf_counter()-t0):,.0f} rows/s"); log.flush()
+
+        def drain(block):
+            while pending and (block or pending[0][1].done()):
+                n, fut = pending.popleft()
+                emit(n, fut.result())
+        try:
+            for chunk in reader:
+                if not header:
+                    out.write(pd.DataFrame(columns=[*chunk.columns, SCORE_COL]).to_csv(index=False).encode("utf-8"))
+                    header = True
+                if pool is None:
+                    emit(len(chunk), _score_chunk(chunk, weights))
+                    continue
+                pending.append((len(chunk), pool.submit(_score_chunk, chunk, weights)))
+                if len(pending) >= 2 * workers:
+                    pending[0][1].result()
+                drain(False)
+            drain(True)
+        finally:
+            if pool is not None: pool.shutdown(cancel_futures=True)
+    secs = time.perf_counter() - t0
+    report = {"rows": rows, "seconds": secs, "rows_per_sec": rows / secs if secs else 0.0, "workers": workers, "chunksize": chunksize}
+    if log:
+        log.write(f"\rscored {rows:,} rows in {secs:.2f}s ({report['rows_per_sec']:,.0f} rows/s, {workers} workers, chunksize {chunksize:,})\n")
+    return report
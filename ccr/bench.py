@@ -0,0 +1,175 @@
+import json, os, platform, statistics, subprocess, sys, tempfile, time, tracemalloc
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from .algorithm import DIMENSIONS, FLAG_COLS, compute_ccr_batch, compute_ccr_single, get_weights, live_ccr_preview
+from . import leaderboard, results
+from .leaderboard import LeaderboardIndex, quarter
+from .storage import RATING_COLUMNS, CsvStore, csv_cache, get_store, set_store
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+# metrics ending in _per_sec are better when higher, everything else (times, memory) when lower
+HIGHER_IS_BETTER = ("_per_sec",)
+IMPORT_MODULES = ["ccr.core", "ccr.algorithm", "ccr.data_io"]
+
+def parse_size(s: str) -> int:
+    s = s.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1:], 1)
+    return int(float(s[:-1] if mult > 1 else s) * mult)
+
+def synth_ratings(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    brands = np.array(["Volt","Aurora","Nimbus","Kiwi","Orbit","Fable","Pulse","Atlas"])
+    channels = np.array(["TikTok","Instagram","YouTube","OOH","TV","Radio","Integrated","Other"])
+    audiences = np.array(["BE urban 16-24","BE Gen Z 18-24","BE mainstream 25-44","NL mainstream 25-44","EU mainstream 25-44"])
+    days = np.array([str(date(2024, 1, 1) + timedelta(days=i)) for i in range(730)])
+    cmp = rng.integers(1, max(2, n // 3), n)
+    df = pd.DataFrame({
+        "campaign_id": np.char.add("CMP", cmp.astype(str)),
+        "rater_id": rng.choice(np.array(["Lode","Maarten","Rater3","Rater4"]), n),
+        "rater_notes": "",
+        "campaign_name": np.char.add("Campaign ", cmp.astype(str)),
+        "brand": rng.choice(brands, n),
+        "channel": rng.choice(channels, n),
+        "scene_audience": rng.choice(audiences, n),
+        "country": rng.choice(np.array(["BE","NL","FR","DE"]), n),
+        "submit_date_iso": rng.choice(days, n),
+        "asset_youtube_url": "",
+    })
+    scores = rng.integers(2, 11, size=(n, len(DIMENSIONS))) / 2.0
+    for j, d in enumerate(DIMENSIONS):
+        df[d] = scores[:, j]
+    for c in FLAG_COLS[:-1]:
+        df[c] = (rng.random(n) < 0.08).astype(int)
+    df[FLAG_COLS[-1]] = np.round(rng.beta(1.5, 8.0, n), 2)
+    return df[RATING_COLUMNS]
+
+def _median_us(fn, args_list) -> float:
+    ts = []
+    for a in args_list:
+        t = time.perf_counter(); fn(*a); ts.append(time.perf_counter() - t)
+    return statistics.median(ts) * 1e6
+
+def _best_s(fn, repeat: int = 3, before=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if before: before()
+        t = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t)
+    return best
+
+def _peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+def bench_size(n: int, workdir: str, repeat: int = 200) -> dict:
+    from . import data_io
+    df = synth_ratings(n)
+    path = os.path.join(workdir, f"ratings_{n}.csv")
+    df.to_csv(path, index=False)
+    store = CsvStore(path)
+    weights = get_weights()
+    records = df.sample(min(repeat, n), random_state=0).to_dict("records")
+    r = {"rows": n, "csv_mb": os.path.getsize(path) / 2**20}
+
+    r["single_score_us"] = _median_us(compute_ccr_single, [(x, weights, x) for x in records])
+    r["live_preview_us"] = _median_us(live_ccr_preview, [(x, x) for x in records])
+    r["batch_score_rows_per_sec"] = n / _best_s(lambda: compute_ccr_batch(df, weights))
+
+    r["load_cold_s"] = _best_s(store.load, before=lambda: csv_cache.invalidate(path))
+    r["load_cached_s"] = _best_s(store.load)
+    loaded = store.load()
+    csv_cache.invalidate(path)
+    r["load_peak_mb"] = _peak_mb(store.load)
+    r["batch_score_peak_mb"] = _peak_mb(lambda: compute_ccr_batch(loaded, weights))
+
+    # "top 20 for TikTok / BE Gen Z 18-24 this quarter": leaderboard index vs load + filter + score + sort
+    r["leaderboard_build_s"] = _best_s(lambda: LeaderboardIndex(weights).add(loaded), repeat=1)
+    idx = LeaderboardIndex(weights).add(loaded)
+    q = {"channel": "TikTok", "scene_audience": "BE Gen Z 18-24", "period": quarter(loaded["submit_date_iso"].max())}
+    r["leaderboard_topk_us"] = _median_us(lambda: idx.top(20, **q), [()] * 50)
+    r["leaderboard_scan_ms"] = _best_s(lambda: idx.scan_top(store.load(), 20, **q)) * 1e3
+    live = [idx]  # a save folds the rating into a copy of the current index (leaderboard.saved)
+    def lb_save(rows): live[0] = live[0].copy().add_rows(rows)
+    r["leaderboard_save_us"] = _median_us(lb_save, [([x],) for x in records[:50]])
+
+    saves = records[:min(50, len(records))]
+    r["append_ms"] = _median_us(store.append, [([x],) for x in saves]) / 1e3
+    # a save as the app does it (data_io.save_rating): append, then fold into the campaign aggregates and the
+    # leaderboard index, both built beforehand as they are in a running app
+    agg = os.path.join(workdir, f"aggregates_{n}.sqlite")
+    t = time.perf_counter(); results.load_current(agg, store); r["aggregates_build_s"] = time.perf_counter() - t
+    leaderboard.engine(store)
+    r["save_ms"] = _median_us(lambda x: data_io.save_rating(x, store, agg), [(x,) for x in saves]) / 1e3
+    if not results.is_current(agg, store) or leaderboard._indexes.get((store.name, store.path), (None,))[0] != store.version():
+        raise RuntimeError("save_rating left the aggregates or the leaderboard index behind (would rebuild on next read)")
+    leaderboard._indexes.pop((store.name, store.path), None)
+
+    prev = get_store()
+    set_store(store)
+    try:
+        seq = os.path.join(workdir, f"seq_{n}")
+        t = time.perf_counter(); data_io.next_campaign_id(path=seq); r["next_id_seed_ms"] = (time.perf_counter() - t) * 1e3
+        r["next_id_us"] = _median_us(data_io.next_campaign_id, [("CMP", seq)] * 50)
+    finally:
+        set_store(prev)
+    csv_cache.invalidate(path)
+    os.remove(path)
+    return r
+
+def import_time_ms(module: str, repeat: int = 3) -> float:
+    # best-of-N cold import in a fresh interpreter
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1e3)"
+    env = {**os.environ, "PYTHONPATH": root + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    return min(float(subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout)
+               for _ in range(repeat))
+
+def run(sizes=None, log=print) -> dict:
+    out = {"meta": {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                    "numpy": np.__version__, "pandas": pd.__version__, "machine": platform.machine(),
+                    "cpus": os.cpu_count()},
+           "imports": {m: import_time_ms(m) for m in IMPORT_MODULES},
+           "results": []}
+    if log: log("import ms  " + "  ".join(f"{m}={v:.1f}" for m, v in out["imports"].items()))
+    with tempfile.TemporaryDirectory(prefix="ccr-bench-") as d:
+        for n in sizes or DEFAULT_SIZES:
+            r = bench_size(n, d)
+            out["results"].append(r)
+            if log: log(format_result(r))
+    return out
+
+def format_result(r: dict) -> str:
+    return "  ".join(f"{k}={v:,.3f}" if isinstance(v, float) else f"{k}={v:,}" for k, v in r.items())
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    # Returns one entry per metric that got worse than the baseline by more than `tolerance` (0.2 = 20%).
+    base = {r["rows"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for m, v in current.get("imports", {}).items():
+        b = baseline.get("imports", {}).get(m)
+        if b and (v - b) / b > tolerance:
+            regressions.append({"rows": 0, "metric": f"import_ms[{m}]", "baseline": b, "current": v, "worse_by": (v - b) / b})
+    for r in current.get("results", []):
+        b = base.get(r["rows"])
+        if not b:
+            continue
+        for k, v in r.items():
+            if k in ("rows", "csv_mb") or k not in b or not b[k]:
+                continue
+            higher = k.endswith(HIGHER_IS_BETTER)
+            change = (b[k] - v) / b[k] if higher else (v - b[k]) / b[k]
+            if change > tolerance:
+                regressions.append({"rows": r["rows"], "metric": k, "baseline": b[k], "current": v, "worse_by": change})
+    return regressions
+
+def save(result: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
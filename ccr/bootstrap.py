@@ -0,0 +1,94 @@
+# Bootstrap confidence intervals for per-campaign CCR (the mean of its ratings' CCR) and leaderboard rank
+# stability. Campaigns are split into fixed-size blocks, each with its own SeedSequence child, so results
+# depend only on `seed` and `block` -- never on the number of worker processes.
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .algorithm import compute_ccr_batch, get_weights
+
+MAX_DRAWS = 2_000_000  # resample means held at once per size group, bounds worker memory
+
+def _block(values, sizes, seed_seq, n_boot, alpha, n_keep):
+    # values: ratings' CCR sorted by campaign; sizes: ratings per campaign in this block
+    rng = np.random.default_rng(seed_seq)
+    n = len(sizes)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    lo, hi, se = np.empty(n), np.empty(n), np.empty(n)
+    keep = np.empty((n, n_keep), dtype=np.float32)
+    for m in np.unique(sizes):
+        rows = np.flatnonzero(sizes == m)
+        x = values[starts[rows, None] + np.arange(m)]            # (g x m) ratings of every campaign of size m
+        if m == 1:
+            lo[rows] = hi[rows] = x[:, 0]; se[rows] = 0.0; keep[rows] = x[:, :1]
+            continue
+        step = max(1, MAX_DRAWS // n_boot)
+        for i in range(0, len(rows), step):
+            r, flat = rows[i:i + step], x[i:i + step].ravel()
+            base = (np.arange(len(r)) * m)[:, None]
+            reps = np.zeros((len(r), n_boot))                     # (g x n_boot) resample means
+            for _ in range(m):
+                reps += flat[base + rng.integers(0, m, size=(len(r), n_boot))]
+            reps /= m
+            lo[r], hi[r] = np.quantile(reps, [alpha / 2, 1 - alpha / 2], axis=1)
+            se[r] = reps.std(axis=1, ddof=1)
+            keep[r] = reps[:, :n_keep]
+    return lo, hi, se, keep
+
+def bootstrap_campaigns(df: pd.DataFrame, n_boot: int = 1000, alpha: float = 0.05, seed: int = 0, workers: int = None,
+                        block: int = 5000, rank_replicates: int = 100, top_k: int = 20, weights: dict = None):
+    # Returns (per-campaign DataFrame, summary dict). rank_replicates of the bootstrap draws are ranked
+    # jointly across all campaigns to estimate rank intervals, P(top_k) and Spearman rank stability.
+    ccr = compute_ccr_batch(df, weights or get_weights())
+    codes, campaigns = pd.factorize(df["campaign_id"].astype(str), sort=True)
+    order = np.argsort(codes, kind="stable")
+    values, sizes = ccr[order], np.bincount(codes, minlength=len(campaigns))
+    n_keep = max(1, min(rank_replicates, n_boot))
+    bounds = list(range(0, len(campaigns), block)) + [len(campaigns)]
+    offsets = np.r_[0, np.cumsum(sizes)]
+    children = np.random.SeedSequence(seed).spawn(len(bounds) - 1)
+    jobs = [(values[offsets[a]:offsets[b]], sizes[a:b], children[i], n_boot, alpha, n_keep)
+            for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:]))]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            parts = list(pool.map(_block, *zip(*jobs)))
+    else:
+        parts = [_block(*j) for j in jobs]
+    lo, hi, se, keep = (np.concatenate(p) for p in zip(*parts)) if parts else (np.empty(0),) * 3 + (np.empty((0, n_keep)),)
+
+    mean = np.bincount(codes, ccr, len(campaigns)) / np.maximum(sizes, 1)
+    point_rank = _ranks(mean[:, None])[:, 0]
+    rep_rank = _ranks(keep)                                       # (C x R) rank of each campaign per replicate
+    out = pd.DataFrame({"campaign_id": campaigns, "n_ratings": sizes, "CCR_mean": mean,
+                        "CCR_se": se, "CCR_ci_low": lo, "CCR_ci_high": hi, "rank": point_rank})
+    if len(out):
+        out["rank_ci_low"], out["rank_ci_high"] = np.quantile(rep_rank, [alpha / 2, 1 - alpha / 2], axis=1).astype(int)
+        out[f"p_top{top_k}"] = (rep_rank <= top_k).mean(axis=1)
+    out = out.sort_values("rank").reset_index(drop=True)
+    summary = {"campaigns": len(campaigns), "ratings": len(df), "n_boot": n_boot, "alpha": alpha, "seed": seed,
+               "rank_replicates": n_keep, "spearman_rank_stability": _spearman(point_rank, rep_rank),
+               f"top{top_k}_overlap": _top_overlap(point_rank, rep_rank, top_k)}
+    return out, summary
+
+def _ranks(x: np.ndarray) -> np.ndarray:
+    # 1 = highest, per column
+    r = np.empty(x.shape, dtype=np.int64)
+    order = np.argsort(-x, axis=0, kind="stable")
+    np.put_along_axis(r, order, np.arange(1, len(x) + 1)[:, None], axis=0)
+    return r
+
+def _spearman(point_rank, rep_rank) -> float:
+    # mean Spearman correlation between the point-estimate ranking and each bootstrap ranking
+    n = len(point_rank)
+    if n < 2:
+        return float("nan")
+    d2 = ((rep_rank - point_rank[:, None]).astype(float) ** 2).sum(axis=0)
+    return float(np.mean(1 - 6 * d2 / (n * (n * n - 1))))
+
+def _top_overlap(point_rank, rep_rank, k) -> float:
+    # average share of the point-estimate top k that stays in the top k across replicates
+    top = point_rank <= k
+    if not top.any():
+        return float("nan")
+    return float((rep_rank[top] <= k).sum(axis=0).mean() / top.sum())
@@ -0,0 +1,174 @@
+# Scoring core: NumPy + stdlib only and no I/O at import time, so workers, services and serverless jobs
+# can import it cheaply. Weights are read lazily from WEIGHTS_JSON (or $CCR_WEIGHTS) and cached per mtime.
+import json, os, threading
+from functools import lru_cache
+import numpy as np
+
+DATA_DIR = "data"
+WEIGHTS_JSON = os.path.join(DATA_DIR, "CCR_default_weights.json")
+
+BASE_WEIGHTS = {
+    "CR_cultural_resonance": 0.18,
+    "OR_originality": 0.12,
+    "TI_timeliness": 0.10,
+    "IE_inclusivity_ethics": 0.08,
+    "SH_shareability": 0.10,
+    "BF_brand_channel_fit": 0.08,
+    "CQ_craft_quality": 0.08,
+    "AU_authenticity_voice": 0.06,
+    "EM_emotional_impact": 0.06,
+    "NA_narrative_strength": 0.05,
+    "PN_platform_nativeness": 0.05,
+    "CC_cultural_contribution": 0.04,
+}
+
+DIMENSIONS = list(BASE_WEIGHTS.keys())
+FLAG_COLS = ["flag_stereotype","flag_misappropriation","flag_sensitive_timing","flag_other_risk","neg_sentiment_ratio_estimate"]
+
+def load_weights(path: str = WEIGHTS_JSON, base: dict = None, strict: bool = False) -> dict:
+    w = dict(BASE_WEIGHTS if base is None else base)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for k, v in json.load(f).items():
+                if k in w:
+                    w[k] = float(v)
+    except Exception:
+        if strict: raise
+    return w
+
+_weights_lock = threading.Lock()
+_weights = {}
+
+def get_weights(path: str = None) -> dict:
+    # the configured weights, re-read only when the file's mtime changes; treat the result as read-only
+    path = path or os.environ.get("CCR_WEIGHTS") or WEIGHTS_JSON
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _weights_lock:
+        hit = _weights.get(path)
+        if hit is None or hit[0] != mtime:
+            hit = _weights[path] = (mtime, load_weights(path))
+        return hit[1]
+
+def __getattr__(name):
+    if name == "DEFAULT_WEIGHTS":
+        return get_weights()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _num(x):
+    if isinstance(x, (int, float, np.number)):
+        return x
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _to_0_100(x):
+    if isinstance(x, np.ndarray):
+        return (x.astype(float) - 1.0)/4.0*100.0
+    return (_num(x) - 1.0)/4.0*100.0
+
+def _concave(x100, gamma=0.85):
+    x01 = np.clip(x100/100.0, 0, 1)
+    y01 = np.power(x01, gamma)
+    return 100.0 * y01
+
+def _risk_penalty(flags):
+    f = int(flags.get("flag_stereotype", 0)) + int(flags.get("flag_misappropriation", 0)) + int(flags.get("flag_sensitive_timing", 0)) + int(flags.get("flag_other_risk", 0))
+    p = -3.0 * f
+    if f >= 2: p += -4.0
+    p += -12.0 * float(flags.get("neg_sentiment_ratio_estimate", 0.0))
+    return p
+
+def _timeliness_boost(ti100):
+    return 0.98 + 0.08 * (ti100/100.0)
+
+def _normalize_weights(w: dict) -> dict:
+    s = sum(max(0.0, float(v)) for v in w.values()) or 1.0
+    return {k: max(0.0, float(v))/s for k,v in w.items()}
+
+def compute_ccr_single(scores_1to5: dict, weights: dict, flags: dict) -> float:
+    w_norm = _normalize_weights(weights)
+    scaled = {d: _concave(_to_0_100(scores_1to5.get(d, 3.0))) for d in DIMENSIONS}
+    core = sum(w_norm[d]*scaled[d] for d in DIMENSIONS)
+    ti100_raw = _to_0_100(scores_1to5.get("TI_timeliness", 3.0))
+    core *= _timeliness_boost(ti100_raw)
+    out = core + _risk_penalty(flags)
+    return float(np.clip(out, 0.0, 100.0))
+
+def _risk_penalty_batch(fm: np.ndarray) -> np.ndarray:
+    f = np.trunc(fm[:, :4]).sum(axis=1)
+    p = -3.0 * f
+    p = np.where(f >= 2, p + -4.0, p)
+    p = p + -12.0 * fm[:, 4]
+    return p
+
+def score_arrays(sm: np.ndarray, fm: np.ndarray):
+    # weight-independent parts for an (N x 12) score and (N x 5) flag matrix: concave-scaled matrix,
+    # timeliness boost and risk penalty. CCR = clip((scaled @ w_norm) * boost + penalty, 0, 100).
+    x100 = (sm - 1.0)/4.0*100.0
+    return _concave(x100), _timeliness_boost(x100[:, DIMENSIONS.index("TI_timeliness")]), _risk_penalty_batch(fm)
+
+def compute_ccr_array(sm, weights: dict, fm=None) -> np.ndarray:
+    sm = np.asarray(sm, dtype=float).reshape(-1, len(DIMENSIONS))
+    fm = np.zeros((len(sm), len(FLAG_COLS))) if fm is None else np.asarray(fm, dtype=float).reshape(-1, len(FLAG_COLS))
+    scaled, boost, penalty = score_arrays(sm, fm)
+    w_norm = _normalize_weights(weights)
+    # accumulate column by column so the summation order matches the scalar path
+    core = np.zeros(len(scaled))
+    for j, d in enumerate(DIMENSIONS):
+        core = core + w_norm[d]*scaled[:, j]
+    core *= boost
+    out = core + penalty
+    return np.clip(out, 0.0, 100.0)
+
+SCORE_STEPS = tuple(1.0 + 0.5*i for i in range(9))
+SENTIMENT_STEPS = tuple(round(i/100, 2) for i in range(101))
+
+class CompiledScorer:
+    # compute_ccr_single for one weight set, specialised to the slider grid: per-dimension weighted
+    # contributions, the timeliness boost and the risk penalty are precomputed with the same float
+    # operations, so results are bit-identical; off-grid inputs fall back to compute_ccr_single.
+    def __init__(self, weights: dict, memo_size: int = 4096):
+        self.weights = dict(weights)
+        w_norm = _normalize_weights(weights)
+        self._contrib = [{v: w_norm[d]*_concave(_to_0_100(v)) for v in SCORE_STEPS} for d in DIMENSIONS]
+        self._boost = {v: _timeliness_boost(_to_0_100(v)) for v in SCORE_STEPS}
+        self._ti = DIMENSIONS.index("TI_timeliness")
+        self._penalty = {(f, r): _risk_penalty({"flag_stereotype": f, "neg_sentiment_ratio_estimate": r})
+                         for f in range(5) for r in SENTIMENT_STEPS}
+        self._memo = lru_cache(maxsize=memo_size)(self._score)
+
+    def __call__(self, scores: dict, flags: dict) -> float:
+        key = (tuple(scores.get(d, 3.0) for d in DIMENSIONS), tuple(flags.get(c, 0) for c in FLAG_COLS))
+        try:
+            return self._memo(key)
+        except TypeError:  # unhashable input
+            return compute_ccr_single(scores, self.weights, flags)
+
+    def cache_info(self):
+        return self._memo.cache_info()
+
+    def _score(self, key) -> float:
+        vals, fl = key
+        try:
+            core = 0
+            for table, v in zip(self._contrib, vals):
+                core = core + table[v]
+            core *= self._boost[vals[self._ti]]
+            out = core + self._penalty[(sum(int(x) for x in fl[:4]), fl[4])]
+        except (KeyError, TypeError, ValueError):
+            return compute_ccr_single(dict(zip(DIMENSIONS, vals)), self.weights, dict(zip(FLAG_COLS, fl)))
+        return float(np.clip(out, 0.0, 100.0))
+
+@lru_cache(maxsize=16)
+def _compiled(weights_key: tuple) -> CompiledScorer:
+    return CompiledScorer(dict(weights_key))
+
+def compiled_scorer(weights: dict) -> CompiledScorer:
+    return _compiled(tuple(weights.items()))
+
+def live_ccr_preview(scores: dict, flags: dict) -> float:
+    return compiled_scorer(get_weights())(scores, flags)
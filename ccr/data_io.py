@@ -1,39 +1,96 @@
-import os, re
+import os
+import numpy as np
 import pandas as pd
-from .algorithm import DIMENSIONS, FLAG_COLS
+from . import leaderboard, results
+from .algorithm import compute_ccr_batch, get_weights
+from .perf import annotate, span
+from .storage import CsvStore, csv_cache, get_store, locked, store_path
 
 DATA_DIR = "data"
-RATINGS_CSV = os.path.join(DATA_DIR, "CCR_ratings.csv")
-RESULTS_CSV = os.path.join(DATA_DIR, "CCR_results.csv")
-os.makedirs(DATA_DIR, exist_ok=True)
+RATINGS_CSV = store_path("csv", DATA_DIR)  # where get_store() keeps ratings by default; defined in ccr.storage
+# per-campaign aggregates (ccr.results); the legacy, hand-made CCR_results.csv is never written
+RESULTS_DB = os.path.join(DATA_DIR, "CCR_campaign_aggregates.sqlite")
+CAMPAIGN_SEQ = os.path.join(DATA_DIR, "CCR_campaign_seq")
 
 def ensure_csv(path):
+    CsvStore(path).ensure()
+
+def load_ratings(**filters):
+    # filters: campaign_id / rater_id / brand / channel / country equality, since / until ISO dates, days=N
+    with span("load_ratings"):
+        df = get_store().load(**filters)
+        annotate(rows=len(df), backend=get_store().name)
+        return df
+
+def count_ratings(**filters) -> int:
+    return get_store().count(**filters)
+
+def ratings_page(page: int = 1, page_size: int = 50, sort: str = "ccr_desc", **filters):
+    # One page of filtered ratings with their computed CCR. sort: ccr_desc / ccr_asc / newest / oldest.
+    df = load_ratings(**filters)
+    if sort in ("ccr_desc", "ccr_asc"):
+        ccr = compute_ccr_batch(df, get_weights())
+        order = np.argsort(-ccr if sort == "ccr_desc" else ccr, kind="stable")
+    else:
+        # by date, ties in insertion order; storage order itself is not chronological (imports, parquet compaction)
+        ccr = None
+        order = np.argsort(df["submit_date_iso"].fillna("").astype(str).to_numpy(), kind="stable")
+        order = order[::-1] if sort == "newest" else order
+    start = max(0, (page - 1) * page_size)
+    idx = order[start:start + page_size]
+    out = df.iloc[idx].reset_index(drop=True)
+    out.insert(0, "CCR", ccr[idx] if ccr is not None else compute_ccr_batch(out, get_weights()))
+    return out
+
+def ratings_cache_stats() -> dict:
+    return csv_cache.stats()
+
+def save_rating(row: dict, store=None, results_path: str = RESULTS_DB):
+    store = store or get_store()
+    before, after = store.append([row])
+    results.update(row, results_path, store, before, after)
+    leaderboard.saved([row], store, before, after)
+
+def load_results():
+    # per-campaign aggregates, maintained on every save; built from the ratings on first use
+    return results.load_current(RESULTS_DB)
+
+def max_campaign_number(ids) -> int:
+    # highest numeric part of ids like "CMP042"; 0 if there is none
+    nums = pd.Series(ids, dtype=object).dropna().astype(str).str.extract(r"^[A-Za-z]*(\d+)$")[0].dropna()
+    return int(nums.astype(int).max()) if len(nums) else 0
+
+def _max_campaign_number() -> int:
+    return max_campaign_number(load_ratings()["campaign_id"])
+
+def _campaign_seq(path: str, take: int) -> int:
+    # Persistent counter shared by every session and server process: a fixed-width number (the last id
+    # handed out) read and rewritten in place under an exclusive lock. Seeded once from the existing ratings.
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "r+b") as f, locked(f):
+        raw = f.read(32).strip()
+        n = (int(raw) if raw else _max_campaign_number()) + take
+        if take or not raw:
+            f.seek(0); f.write(f"{n:020d}\n".encode())
+            f.flush(); os.fsync(fd)
+    return n
+
+def next_campaign_id(prefix: str = "CMP", path: str = CAMPAIGN_SEQ) -> str:
+    # takes the next id for good; call it when a rating is saved, not when a form is shown
+    return f"{prefix}{_campaign_seq(path, 1):03d}"
+
+def peek_campaign_id(prefix: str = "CMP", path: str = CAMPAIGN_SEQ) -> str:
+    # the id next_campaign_id() would return now, without taking it
+    return f"{prefix}{_campaign_seq(path, 0) + 1:03d}"
+
+def advance_campaign_seq(n: int, path: str = CAMPAIGN_SEQ):
+    # make sure next_campaign_id() never hands out a number <= n (e.g. after a bulk import)
     if not os.path.exists(path):
-        cols = ["campaign_id","rater_id","rater_notes",
-                "campaign_name","brand","channel","scene_audience","country","submit_date_iso","asset_youtube_url",
-                *DIMENSIONS, *FLAG_COLS]
-        pd.DataFrame(columns=cols).to_csv(path, index=False)
-
-def load_ratings():
-    ensure_csv(RATINGS_CSV)
-    try:
-        return pd.read_csv(RATINGS_CSV)
-    except Exception:
-        return pd.DataFrame(columns=["campaign_id","rater_id","rater_notes",
-                                     "campaign_name","brand","channel","scene_audience","country","submit_date_iso","asset_youtube_url",
-                                     *DIMENSIONS, *FLAG_COLS])
-
-def save_rating(row: dict):
-    df = load_ratings()
-    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    df.to_csv(RATINGS_CSV, index=False)
-
-def next_campaign_id(df: pd.DataFrame) -> str:
-    if df.empty or "campaign_id" not in df.columns or df["campaign_id"].dropna().empty:
-        return "CMP001"
-    last = str(df["campaign_id"].dropna().iloc[-1])
-    m = re.match(r"([A-Za-z]*)(\d+)$", last)
-    if m:
-        prefix, num = m.group(1) or "CMP", m.group(2)
-        return f"{prefix}{int(num)+1:03d}"
-    return f"CMP{len(df)+1:03d}"
+        return  # not seeded yet: the first allocation seeds from the ratings, imported ones included
+    with open(path, "r+b") as f, locked(f):
+        raw = f.read(32).strip()
+        if not raw or int(raw) >= n:  # empty: still to be seeded from the ratings
+            return
+        f.seek(0); f.write(f"{n:020d}\n".encode())
+        f.flush(); os.fsync(f.fileno())
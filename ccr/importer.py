@@ -0,0 +1,196 @@
+# Streaming bulk import of rating files in older/partner layouts (7-dimension demo files, rubric templates,
+# results-shaped exports). Headers are mapped onto RATING_COLUMNS once per file, chunks are normalised and
+# deduplicated on (campaign_id, rater_id, submit_date_iso) against an on-disk SQLite key index, then appended
+# to the store, so memory stays bounded by the chunk size.
+import os, re, sqlite3
+import numpy as np
+import pandas as pd
+from .algorithm import DIMENSIONS, FLAG_COLS
+from .storage import RATING_COLUMNS, TEXT_COLS
+
+KEY_COLS = ["campaign_id", "rater_id", "submit_date_iso"]
+DIMENSION_DEFAULT = 3.0  # neutral midpoint, same as a fresh evaluation form
+FLAG_DEFAULT = 0.0
+
+def _norm(name) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name).strip().lower()).strip("_")
+
+# accepted spellings -> current column; every canonical name (any case/spacing) plus the dimension codes
+ALIASES = {_norm(c): c for c in RATING_COLUMNS}
+ALIASES.update({_norm(d.split("_", 1)[0]): d for d in DIMENSIONS})
+ALIASES.update({
+    "campaign": "campaign_id", "campaign_code": "campaign_id", "rater": "rater_id", "evaluator": "rater_id",
+    "notes": "rater_notes", "comment": "rater_notes", "comments": "rater_notes", "name": "campaign_name",
+    "audience": "scene_audience", "scene": "scene_audience", "date": "submit_date_iso", "submit_date": "submit_date_iso",
+    "submitted": "submit_date_iso", "youtube_url": "asset_youtube_url", "asset_url": "asset_youtube_url", "url": "asset_youtube_url",
+    "neg_sentiment": "neg_sentiment_ratio_estimate", "neg_sentiment_ratio": "neg_sentiment_ratio_estimate",
+})
+
+def map_columns(header, overrides: dict = None):
+    # -> ({source column: target column}, [ignored source columns]); the first source wins for a target
+    overrides = {_norm(k): v for k, v in (overrides or {}).items()}
+    for v in overrides.values():
+        if v not in RATING_COLUMNS:
+            raise ValueError(f"unknown target column in mapping: {v}")
+    mapping, ignored = {}, []
+    for col in header:
+        target = overrides.get(_norm(col)) or ALIASES.get(_norm(col))
+        if target and target not in mapping.values():
+            mapping[col] = target
+        else:
+            ignored.append(col)
+    return mapping, ignored
+
+def _iso_dates(s: pd.Series) -> pd.Series:
+    d = pd.to_datetime(s, errors="coerce", format="ISO8601")
+    odd = d.isna() & (s != "")
+    if odd.any():  # only non-ISO stragglers take the slow per-value parser
+        d[odd] = pd.to_datetime(s[odd], errors="coerce", format="mixed")
+    return d.dt.strftime("%Y-%m-%d").where(d.notna(), s)
+
+def normalize_chunk(chunk: pd.DataFrame, mapping: dict, defaults: dict = None, stats: dict = None) -> pd.DataFrame:
+    # rename/reorder onto RATING_COLUMNS; missing scores get DIMENSION_DEFAULT (or defaults[col]), flags 0
+    defaults = defaults or {}
+    df = chunk[list(mapping)].rename(columns=mapping).reindex(columns=RATING_COLUMNS)
+    for c in TEXT_COLS:
+        s = df[c].astype(object).str.strip() if c in mapping.values() else df[c].astype(object)
+        s = s.where(s.notna() & (s != ""), None)
+        if c in defaults:
+            s = s.where(s.notna(), str(defaults[c]))
+        df[c] = s
+    for c in KEY_COLS:
+        df[c] = df[c].fillna("")
+    df["submit_date_iso"] = _iso_dates(df["submit_date_iso"])
+    for c in DIMENSIONS + FLAG_COLS:
+        v = pd.to_numeric(df[c], errors="coerce")
+        missing = int(v.isna().sum())
+        if missing:
+            v = v.fillna(float(defaults.get(c, DIMENSION_DEFAULT if c in DIMENSIONS else FLAG_DEFAULT)))
+            if stats is not None:
+                stats[c] = stats.get(c, 0) + missing
+        df[c] = v.astype(float)
+    return df
+
+class KeyIndex:
+    # On-disk set of (campaign_id, rater_id, submit_date_iso) already present in one store. Rows saved by the
+    # app bypass the importer, so sync() folds in whatever the store gained since the last import.
+    def __init__(self, path):
+        self.path = path
+        d = os.path.dirname(path)
+        if d: os.makedirs(d, exist_ok=True)
+        self.con = sqlite3.connect(path, timeout=30)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("CREATE TABLE IF NOT EXISTS keys (campaign_id TEXT, rater_id TEXT, submit_date_iso TEXT, "
+                         "PRIMARY KEY (campaign_id, rater_id, submit_date_iso)) WITHOUT ROWID")
+        self.con.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v)")
+        self.con.commit()
+
+    def close(self):
+        self.con.close()
+
+    def _meta(self, k, default=None):
+        r = self.con.execute("SELECT v FROM meta WHERE k = ?", (k,)).fetchone()
+        return r[0] if r else default
+
+    def __len__(self):
+        return self.con.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def sync(self, store, chunksize=100_000) -> int:
+        version = repr(store.version())
+        if version == self._meta("version"):
+            return 0
+        # csv/sqlite only ever append in insertion order, so just the tail is new; parquet compaction
+        # reorders rows, so that is rescanned (INSERT OR IGNORE makes rescans harmless)
+        skip = self._meta("synced_rows", 0) if store.name in ("csv", "sqlite") else 0
+        seen = 0
+        with self.con:
+            # keys are compared as text; read the CSV store as strings so e.g. "007" stays "007"
+            chunks = pd.read_csv(store.path, usecols=KEY_COLS, dtype=str, chunksize=chunksize) \
+                if store.name == "csv" and os.path.exists(store.path) else store.iter_chunks(chunksize)
+            for chunk in chunks:
+                if seen + len(chunk) > skip:
+                    keys = chunk.iloc[max(0, skip - seen):].reindex(columns=KEY_COLS).astype(object)
+                    keys = keys.where(keys.notna(), "").astype(str)
+                    self.con.executemany("INSERT OR IGNORE INTO keys VALUES (?, ?, ?)", keys.itertuples(index=False, name=None))
+                seen += len(chunk)
+            if seen < skip:  # the store was replaced by a smaller one; start over
+                self.con.execute("DELETE FROM keys")
+                self.con.execute("INSERT OR REPLACE INTO meta VALUES ('synced_rows', 0), ('version', NULL)")
+                return self.sync(store, chunksize)
+            self.con.execute("INSERT OR REPLACE INTO meta VALUES ('synced_rows', ?), ('version', ?)", (seen, version))
+        return seen - skip
+
+    def claim(self, df: pd.DataFrame) -> np.ndarray:
+        # mask of rows whose key is new; the keys are inserted but not committed (see commit/rollback)
+        self.con.execute("CREATE TEMP TABLE IF NOT EXISTS batch (i INTEGER, campaign_id TEXT, rater_id TEXT, submit_date_iso TEXT)")
+        self.con.execute("DELETE FROM batch")
+        self.con.executemany("INSERT INTO batch VALUES (?, ?, ?, ?)",
+                             zip(range(len(df)), *(df[c].astype(str).tolist() for c in KEY_COLS)))
+        new = [i for (i,) in self.con.execute(
+            "SELECT i FROM batch b WHERE NOT EXISTS (SELECT 1 FROM keys k WHERE k.campaign_id = b.campaign_id "
+            "AND k.rater_id = b.rater_id AND k.submit_date_iso = b.submit_date_iso)")]
+        self.con.execute("INSERT OR IGNORE INTO keys SELECT campaign_id, rater_id, submit_date_iso FROM batch")
+        mask = np.zeros(len(df), dtype=bool)
+        mask[new] = True
+        return mask
+
+    def commit(self, added_rows: int, store):
+        self.con.execute("UPDATE meta SET v = v + ? WHERE k = 'synced_rows'", (added_rows,))
+        self.con.execute("UPDATE meta SET v = ? WHERE k = 'version'", (repr(store.version()),))
+        self.con.commit()
+
+    def rollback(self):
+        self.con.rollback()
+
+def key_index_path(store) -> str:
+    return store.path.rstrip("/\\") + ".keys.sqlite"
+
+def import_files(paths, store=None, chunksize: int = 50_000, mapping: dict = None, defaults: dict = None,
+                 dry_run: bool = False, index_path: str = None, seq_path: str = None, log=print) -> dict:
+    from .data_io import CAMPAIGN_SEQ, advance_campaign_seq, max_campaign_number
+    from .storage import get_store
+    store = store or get_store()
+    index = KeyIndex(index_path or key_index_path(store))
+    report = {"files": [], "rows_read": 0, "imported": 0, "duplicates": 0, "invalid": 0, "defaulted": {}}
+    try:
+        synced = index.sync(store)
+        if synced:
+            log(f"key index: +{synced:,} keys from {store.name}:{store.path}")
+        for path in paths:
+            header = pd.read_csv(path, nrows=0).columns.tolist()
+            cols, ignored = map_columns(header, mapping)
+            if "campaign_id" not in cols.values():
+                raise ValueError(f"{path}: no campaign_id column (columns: {', '.join(header)})")
+            missing = [c for c in DIMENSIONS + FLAG_COLS if c not in cols.values()]
+            log(f"{path}: {len(cols)} mapped, ignoring {ignored or 'nothing'}, "
+                f"defaulting {len(missing)} missing score/flag column(s)")
+            f = {"path": path, "mapped": cols, "ignored": ignored, "missing": missing, "rows": 0, "imported": 0}
+            for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, usecols=list(cols)):
+                df = normalize_chunk(chunk, cols, defaults, report["defaulted"])
+                ok = df["campaign_id"] != ""
+                df = df[ok & ~df.duplicated(KEY_COLS)].reset_index(drop=True)
+                report["invalid"] += int((~ok).sum())
+                new = index.claim(df)
+                df = df[new]
+                try:
+                    if len(df) and not dry_run:
+                        store.append(df)
+                except BaseException:
+                    index.rollback()
+                    raise
+                if not dry_run:  # a dry run keeps its claimed keys uncommitted and rolls them back at the end
+                    index.commit(len(df), store)
+                    # imported ids must not be handed out again by the campaign id allocator
+                    advance_campaign_seq(max_campaign_number(df["campaign_id"]), seq_path or CAMPAIGN_SEQ)
+                f["rows"] += len(chunk); f["imported"] += len(df)
+                report["rows_read"] += len(chunk); report["imported"] += len(df)
+                report["duplicates"] += int(ok.sum()) - len(df)
+            report["files"].append(f)
+            log(f"{path}: {f['imported']:,} of {f['rows']:,} rows imported")
+        if dry_run:
+            index.rollback()
+        elif report["imported"] and store.name == "parquet":
+            store.compact()
+    finally:
+        index.close()
+    return report
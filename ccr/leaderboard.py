@@ -0,0 +1,220 @@
+# Precomputed campaign leaderboards per (channel, scene_audience, brand, quarter), each attribute also
+# aggregated over "*" (all values), so every slice an account lead can ask for is one dict lookup.
+# Per slice we keep per-campaign CCR sum/count and a list of (-mean, campaign_id) kept sorted with bisect:
+# top-k is a slice of that list and a percentile rank is a binary search. A new rating touches 16 slices.
+import copy, threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import product
+import numpy as np
+import pandas as pd
+from .algorithm import compute_ccr_batch, compute_ccr_single, get_weights
+from .storage import get_store
+
+ALL = "*"
+KEY_ATTRS = ["channel", "scene_audience", "brand"]
+SLICE_ATTRS = [*KEY_ATTRS, "period"]
+META_COLS = ["campaign_name", "brand", "channel", "scene_audience"]
+_MAX = "\U0010ffff"  # sorts after any campaign id
+
+def quarter(d) -> str:
+    # "2025-08-15" -> "2025-Q3"; anything unparseable lands in the "" bucket (only visible under "*")
+    d = str(d or "")
+    try:
+        return f"{int(d[:4]):04d}-Q{(int(d[5:7]) - 1) // 3 + 1}" if d[4:5] == "-" else ""
+    except ValueError:
+        return ""
+
+def _text(df: pd.DataFrame, c: str) -> list:
+    return df[c].astype(object).where(df[c].notna(), "").astype(str).tolist() if c in df.columns else [""] * len(df)
+
+def _str(v) -> str:
+    return "" if v is None or v != v else str(v)
+
+def _deltas_small(recs):
+    # a handful of (channel, audience, brand, period, campaign_id, ccr) ratings: plain loop over their 16 slices
+    delta = {}
+    for ch, aud, br, p, cid, x in recs:
+        for key in product((ch, ALL), (aud, ALL), (br, ALL), (p, ALL)):
+            s, n = delta.setdefault(key, {}).get(cid, (0.0, 0))
+            delta[key][cid] = (s + x, n + 1)
+    return delta.items()
+
+def _deltas(f: pd.DataFrame):
+    # bulk load: one groupby per combination of sliced/"*" attributes
+    for keep in product((True, False), repeat=len(SLICE_ATTRS)):
+        by = [a for a, k in zip(SLICE_ATTRS, keep) if k]
+        agg = f.groupby([*by, "campaign_id"], sort=False)["ccr"].agg(["sum", "count"]).reset_index()
+        parts = agg.groupby(by, sort=False) if by else [((), agg)]
+        for vals, part in parts:
+            vals = iter(vals if isinstance(vals, tuple) else (vals,))
+            key = tuple(next(vals) if k else ALL for k in keep)
+            yield key, dict(zip(part["campaign_id"], zip(part["sum"].tolist(), part["count"].tolist())))
+
+class LeaderboardIndex:
+    def __init__(self, weights: dict):
+        self.weights = dict(weights)
+        self._cells = {}   # slice key -> {campaign_id: (ccr_sum, n)}
+        self._boards = {}  # slice key -> sorted [(-mean, campaign_id)]
+        self.meta = {}     # campaign_id -> latest (campaign_name, brand, channel, scene_audience)
+        self.values = {a: set() for a in SLICE_ATTRS}
+        self.ids = []      # campaign_id per rating in store order; append-only, shared with copies (see copy())
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def copy(self) -> "LeaderboardIndex":
+        # Copy-on-write: containers are copied one level deep and _apply() replaces a slice's cells/board instead
+        # of editing them, so the original stays a consistent snapshot for sessions still reading it. ids is
+        # shared: each index only looks at its first n entries.
+        c = copy.copy(self)
+        c._cells, c._boards, c.meta = dict(self._cells), dict(self._boards), dict(self.meta)
+        c.values = {a: set(v) for a, v in self.values.items()}
+        return c
+
+    def _extend_ids(self, ids):
+        if len(self.ids) != self.n:  # another copy already appended past our end
+            self.ids = self.ids[:self.n]
+        self.ids.extend(ids); self.n = len(self.ids)
+
+    def add(self, df: pd.DataFrame):
+        # fold new ratings into every slice they belong to
+        if not len(df):
+            return self
+        ccr = compute_ccr_batch(df, self.weights)
+        cols = {c: _text(df, c) for c in ["campaign_id", *META_COLS, "submit_date_iso"]}
+        self._extend_ids(cols["campaign_id"])
+        f = pd.DataFrame({**{a: cols[a] for a in KEY_ATTRS}, "period": [quarter(d) for d in cols["submit_date_iso"]],
+                          "campaign_id": cols["campaign_id"], "ccr": ccr})  # column order = _deltas_small tuples
+        ok = ~np.isnan(ccr)
+        f = f[ok]
+        meta = pd.DataFrame({c: cols[c] for c in ["campaign_id", *META_COLS]})[ok].drop_duplicates("campaign_id", keep="last")
+        self.meta.update(zip(meta["campaign_id"], meta[META_COLS].itertuples(index=False, name=None)))
+        for a in SLICE_ATTRS:
+            self.values[a].update(f[a].unique())
+        deltas = _deltas_small(f.itertuples(index=False, name=None)) if len(f) < 64 else _deltas(f)
+        for key, upd in deltas:
+            self._apply(key, upd)
+        return self
+
+    def add_rows(self, rows: list):
+        # same as add() for a few rating dicts (a save), without the pandas overhead
+        recs = []
+        for row in rows:
+            t = {c: _str(row.get(c)) for c in ["campaign_id", *META_COLS, "submit_date_iso"]}
+            self._extend_ids([t["campaign_id"]])
+            x = compute_ccr_single(row, self.weights, row)
+            if x != x:
+                continue
+            recs.append((t["channel"], t["scene_audience"], t["brand"], quarter(t["submit_date_iso"]), t["campaign_id"], x))
+            self.meta[t["campaign_id"]] = tuple(t[c] for c in META_COLS)
+            for a, v in zip(SLICE_ATTRS, recs[-1]):
+                self.values[a].add(v)
+        for key, upd in _deltas_small(recs):
+            self._apply(key, upd)
+        return self
+
+    def _apply(self, key, upd: dict):
+        # builds new cells/board for the slice and swaps them in; the old ones may still be read elsewhere
+        cells = dict(self._cells.get(key, ()))
+        board = self._boards.get(key)
+        if board is None or len(upd) > len(board) // 8:
+            # bulk load: cheaper to re-sort the slice once than to move entries one by one
+            for cid, (s, n) in upd.items():
+                c = cells.get(cid)
+                cells[cid] = (s, n) if c is None else (c[0] + s, c[1] + n)
+            self._cells[key], self._boards[key] = cells, sorted((-s / n, cid) for cid, (s, n) in cells.items())
+            return
+        board = list(board)
+        for cid, (s, n) in upd.items():
+            c = cells.get(cid)
+            if c is not None:
+                del board[bisect_left(board, (-c[0] / c[1], cid))]
+                s, n = c[0] + s, c[1] + n
+            cells[cid] = (s, n)
+            insort(board, (-s / n, cid))
+        self._cells[key], self._boards[key] = cells, board
+
+    def board(self, channel=ALL, scene_audience=ALL, brand=ALL, period=ALL) -> list:
+        return self._boards.get((channel, scene_audience, brand, period), [])
+
+    def top(self, k: int = 20, channel=ALL, scene_audience=ALL, brand=ALL, period=ALL) -> pd.DataFrame:
+        key = (channel, scene_audience, brand, period)
+        board, cells = self._boards.get(key, []), self._cells.get(key, {})
+        head = board[:k]
+        out = pd.DataFrame([(cid, *self.meta.get(cid, ("",) * len(META_COLS))) for _, cid in head],
+                           columns=["campaign_id", *META_COLS])
+        out.insert(0, "rank", [bisect_left(board, (m, "")) + 1 for m, _ in head])
+        out["n_ratings"] = [cells[cid][1] for _, cid in head]
+        out["CCR_mean"] = [-m for m, _ in head]
+        return out
+
+    def percentile_of(self, score: float, channel=ALL, scene_audience=ALL, brand=ALL, period=ALL) -> float:
+        # share (0-100) of the slice's campaigns with a strictly lower CCR than `score`
+        board = self.board(channel, scene_audience, brand, period)
+        return 100.0 * (len(board) - bisect_right(board, (-score, _MAX))) / len(board) if board else float("nan")
+
+    def rank(self, campaign_id, channel=ALL, scene_audience=ALL, brand=ALL, period=ALL):
+        # {"rank", "of", "percentile", "CCR_mean"} of one campaign within a slice, None if it is not in it
+        key = (channel, scene_audience, brand, period)
+        c = self._cells.get(key, {}).get(str(campaign_id))
+        if c is None:
+            return None
+        board, m = self._boards[key], c[0] / c[1]
+        below = len(board) - bisect_right(board, (-m, _MAX))
+        return {"rank": bisect_left(board, (-m, "")) + 1, "of": len(board),
+                "percentile": 100.0 * below / (len(board) - 1) if len(board) > 1 else 100.0, "CCR_mean": m}
+
+    def scan_top(self, df: pd.DataFrame, k: int = 20, channel=ALL, scene_audience=ALL, brand=ALL, period=ALL) -> pd.DataFrame:
+        # the same query answered the slow way (filter, score, group, sort); used to check and benchmark the index
+        mask = np.ones(len(df), dtype=bool)
+        for a, v in zip(KEY_ATTRS, (channel, scene_audience, brand)):
+            if v != ALL:
+                mask &= np.array(_text(df, a), dtype=object) == v
+        if period != ALL:
+            mask &= df["submit_date_iso"].map(quarter).to_numpy() == period
+        sub = df[mask]
+        g = pd.Series(compute_ccr_batch(sub, self.weights), index=sub["campaign_id"].astype(str).to_numpy()) \
+              .groupby(level=0).mean()
+        return g.sort_values(ascending=False, kind="stable").head(k)
+
+_lock = threading.Lock()
+_indexes = {}
+
+def engine(store=None) -> LeaderboardIndex:
+    # one index per store; appended ratings are folded into a copy, anything else triggers a rebuild.
+    # Indexes already handed out are never modified, so pages can read them without holding the lock.
+    store = store or get_store()
+    weights = get_weights()
+    key, version = (store.name, store.path), store.version()
+    with _lock:
+        hit = _indexes.get(key)
+        if hit is not None and hit[0] == version and hit[1].weights == weights:
+            return hit[1]
+        df = store.load()
+        idx = hit[1] if hit is not None else None
+        n = len(idx) if idx is not None else 0
+        if idx is None or idx.weights != weights or len(df) < n or \
+                _text(df.iloc[:n], "campaign_id") != idx.ids[:n]:
+            idx, n = LeaderboardIndex(weights), 0
+        elif len(df) > n:
+            idx = idx.copy()
+        idx.add(df.iloc[n:])
+        if store.version() != version:
+            version = None  # written to while loading: saved() must not fold those rows in a second time
+        _indexes[key] = (version, idx)
+        return idx
+
+def saved(rows, store, before, after):
+    # called right after `rows` were appended to `store`; `before`/`after` are the version()s taken under
+    # the store's write lock around that append. If the cached index was current just before it, fold the rows
+    # into a copy; otherwise something else was written in between, so drop it and let engine() reload.
+    key = (store.name, store.path)
+    with _lock:
+        hit = _indexes.get(key)
+        if hit is None:
+            return
+        if hit[0] == before:
+            _indexes[key] = (after, hit[1].copy().add_rows(rows))
+        else:
+            del _indexes[key]
@@ -0,0 +1,49 @@
+# Closed-loop load generator for ccr.service: N keep-alive connections, each sending its next request as
+# soon as the previous response arrives. Reports p50/p99 latency and requests/sec.
+import asyncio, json, random, time
+from urllib.parse import urlsplit
+import numpy as np
+from .core import DIMENSIONS, FLAG_COLS, SCORE_STEPS
+
+def random_record(rng: random.Random) -> dict:
+    rec = {d: rng.choice(SCORE_STEPS) for d in DIMENSIONS}
+    rec.update({c: int(rng.random() < 0.1) for c in FLAG_COLS[:-1]})
+    rec[FLAG_COLS[-1]] = round(rng.random() * 0.5, 2)
+    return rec
+
+async def _worker(host, port, path, bodies, n, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n):
+            body = bodies[i % len(bodies)]
+            t = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(int(l.split(b":", 1)[1]) for l in head.split(b"\r\n") if l.lower().startswith(b"content-length:"))
+            await reader.readexactly(length)
+            if not head.startswith(b"HTTP/1.1 200"):
+                raise RuntimeError(head.split(b"\r\n", 1)[0].decode())
+            latencies.append(time.perf_counter() - t)
+    finally:
+        writer.close()
+
+async def run(url: str = "http://127.0.0.1:8765", connections: int = 32, requests: int = 10_000, batch: int = 0, seed: int = 0) -> dict:
+    u = urlsplit(url)
+    rng = random.Random(seed)
+    if batch:
+        path = "/score/batch"
+        bodies = [json.dumps({"records": [random_record(rng) for _ in range(batch)]}).encode() for _ in range(16)]
+    else:
+        path = "/score"
+        bodies = [json.dumps(random_record(rng)).encode() for _ in range(256)]
+    per_conn = [requests // connections + (i < requests % connections) for i in range(connections)]
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_worker(u.hostname, u.port or 80, path, bodies, n, latencies) for n in per_conn if n))
+    secs = time.perf_counter() - t0
+    lat = np.array(latencies) * 1e3
+    return {"endpoint": path, "connections": connections, "requests": len(lat), "records_per_request": batch or 1,
+            "seconds": secs, "requests_per_sec": len(lat) / secs, "records_per_sec": len(lat) * (batch or 1) / secs,
+            "p50_ms": float(np.percentile(lat, 50)), "p99_ms": float(np.percentile(lat, 99)), "max_ms": float(lat.max())}
@@ -0,0 +1,101 @@
+# Span-style timing for Streamlit reruns. Off unless CCR_PROFILE is set ("1" = timings, "alloc" = also
+# net tracemalloc allocation per span); when off, span() hands back one shared no-op context manager.
+# Each rerun is appended as one JSON line to CCR_PROFILE_LOG (default data/CCR_profile.jsonl), rotated
+# to <log>.1 once it grows past CCR_PROFILE_MAX_MB.
+import json, os, threading, time
+from contextlib import contextmanager, nullcontext
+
+MODE = os.environ.get("CCR_PROFILE", "").strip().lower()
+ENABLED = MODE not in ("", "0", "false", "off")
+ALLOC = MODE == "alloc"
+LOG_PATH = os.environ.get("CCR_PROFILE_LOG", os.path.join("data", "CCR_profile.jsonl"))
+MAX_BYTES = int(float(os.environ.get("CCR_PROFILE_MAX_MB", "5")) * 2**20)
+
+_NULL = nullcontext()
+_local = threading.local()
+_write_lock = threading.Lock()
+
+if ALLOC:
+    import tracemalloc
+    tracemalloc.start()
+
+def span(name: str, **attrs):
+    if not ENABLED:
+        return _NULL
+    return _span(name, attrs)
+
+@contextmanager
+def _span(name, attrs):
+    rec = getattr(_local, "rerun", None)
+    a0 = tracemalloc.get_traced_memory()[0] if ALLOC else 0
+    t0 = time.perf_counter()
+    entry = {"name": name, **attrs}
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(entry)
+    try:
+        yield entry
+    finally:
+        stack.pop()
+        entry["ms"] = (time.perf_counter() - t0) * 1e3
+        if ALLOC:
+            entry["alloc_kb"] = (tracemalloc.get_traced_memory()[0] - a0) / 1024
+        if rec is not None:
+            rec["spans"].append(entry)
+
+def annotate(**attrs):
+    # attach attributes (e.g. rows=...) to the innermost open span
+    if ENABLED and getattr(_local, "stack", None):
+        _local.stack[-1].update(attrs)
+
+@contextmanager
+def rerun(page: str = "app"):
+    if not ENABLED:
+        yield None
+        return
+    rec = _local.rerun = {"ts": time.time(), "page": page, "thread": threading.current_thread().name, "spans": []}
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        rec["total_ms"] = (time.perf_counter() - t0) * 1e3
+        _local.rerun = None
+        _append(rec)
+
+def _append(rec: dict, path: str = None):
+    path = path or LOG_PATH
+    line = json.dumps(rec, default=str) + "\n"
+    with _write_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) + len(line) > MAX_BYTES:
+            os.replace(path, path + ".1")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+def read_log(path: str = None, include_rotated: bool = True) -> list:
+    path = path or LOG_PATH
+    out = []
+    for p in ([path + ".1"] if include_rotated else []) + [path]:
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                out.extend(json.loads(l) for l in f if l.strip())
+        except FileNotFoundError:
+            pass
+    return out
+
+def summary(records: list):
+    # per-stage count / mean / p50 / p95 / max in ms, slowest p95 first
+    import pandas as pd
+    rows = [(s["name"], s["ms"]) for r in records for s in r.get("spans", [])]
+    rows += [("(rerun total)", r["total_ms"]) for r in records if "total_ms" in r]
+    if not rows:
+        return pd.DataFrame(columns=["stage", "count", "mean_ms", "p50_ms", "p95_ms", "max_ms"])
+    df = pd.DataFrame(rows, columns=["stage", "ms"])
+    g = df.groupby("stage")["ms"]
+    out = pd.DataFrame({"count": g.size(), "mean_ms": g.mean(), "p50_ms": g.median(),
+                        "p95_ms": g.quantile(0.95), "max_ms": g.max()}).reset_index()
+    return out.sort_values("p95_ms", ascending=False, ignore_index=True)
+
+def spans_named(records: list, name: str) -> list:
+    return [s for r in records for s in r.get("spans", []) if s["name"] == name]
@@ -0,0 +1,153 @@
+# Inter-rater agreement over the whole rating history. Everything is derived from per-campaign sufficient
+# statistics (count, sum, sum of squares per dimension), kept in (campaigns x measures) arrays, so new
+# ratings are folded in with np.add.at and alpha / ICC cost O(campaigns) -- no Python loop per campaign.
+import copy, threading
+import numpy as np
+import pandas as pd
+from .algorithm import DIMENSIONS, compute_ccr_batch, get_weights
+from .storage import get_store
+
+MEASURES = [*DIMENSIONS, "CCR"]
+
+def _alpha_icc(m, s1, s2):
+    # m, s1, s2: (C x K) counts, sums and sums of squares. Only campaigns with >= 2 ratings are pairable.
+    m = np.where(m >= 2, m, 0)
+    s1, s2 = np.where(m > 0, s1, 0.0), np.where(m > 0, s2, 0.0)
+    n, S1, S2 = m.sum(axis=0), s1.sum(axis=0), s2.sum(axis=0)
+    k = (m > 0).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Krippendorff's alpha, interval metric: sum over ordered pairs of (xi - xj)^2 is 2 (m*sum(x^2) - sum(x)^2)
+        within = np.where(m > 1, 2.0 * (m * s2 - s1**2) / (m - 1), 0.0).sum(axis=0)
+        d_o = within / n
+        d_e = 2.0 * (n * S2 - S1**2) / (n * (n - 1))
+        alpha = 1.0 - d_o / d_e
+        # ICC(1), one-way random effects for unbalanced groups
+        ssb = np.where(m > 0, s1**2 / np.where(m > 0, m, 1), 0.0).sum(axis=0) - S1**2 / n
+        ssw = S2 - np.where(m > 0, s1**2 / np.where(m > 0, m, 1), 0.0).sum(axis=0)
+        msb, msw = ssb / (k - 1), ssw / (n - k)
+        n0 = (n - (m**2).sum(axis=0) / n) / (k - 1)
+        icc = (msb - msw) / (msb + (n0 - 1) * msw)
+    return alpha, icc, k, n
+
+class ReliabilityEngine:
+    def __init__(self, weights: dict = None):
+        self.weights = dict(weights or get_weights())
+        self.campaign_index, self.rater_index = {}, {}
+        self.campaigns, self.raters = [], []
+        self.stats = np.zeros((3, 0, len(MEASURES)))        # count / sum / sum of squares per campaign
+        self.codes = np.zeros(0, dtype=np.int64)             # campaign of each rating
+        self.rater_codes = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros((0, len(MEASURES)))          # per rating: 12 dimensions + CCR
+        self.ids = np.zeros(0, dtype=object)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _encode(self, labels, index: dict, names: list) -> np.ndarray:
+        uniq, inv = np.unique(labels, return_inverse=True)
+        mapped = np.empty(len(uniq), dtype=np.int64)
+        for i, u in enumerate(uniq):  # loop over distinct new labels only
+            if u not in index:
+                index[u] = len(names); names.append(u)
+            mapped[i] = index[u]
+        return mapped[inv]
+
+    def copy(self) -> "ReliabilityEngine":
+        # arrays are only ever replaced, never written in place, so sharing them is safe
+        c = copy.copy(self)
+        c.campaign_index, c.rater_index = dict(self.campaign_index), dict(self.rater_index)
+        c.campaigns, c.raters = list(self.campaigns), list(self.raters)
+        return c
+
+    def update(self, df: pd.DataFrame):
+        # fold newly landed ratings into the statistics
+        if not len(df):
+            return self
+        ids = df["campaign_id"].astype(str).to_numpy()
+        raters = df["rater_id"].astype(str).to_numpy() if "rater_id" in df.columns else np.full(len(df), "")
+        codes = self._encode(ids, self.campaign_index, self.campaigns)
+        rcodes = self._encode(raters, self.rater_index, self.raters)
+        vals = np.column_stack([pd.to_numeric(df[d], errors="coerce").to_numpy(dtype=float) if d in df.columns
+                                else np.full(len(df), 3.0) for d in DIMENSIONS] + [compute_ccr_batch(df, self.weights)])
+        # new arrays are built first and swapped in together, so the engine is never seen half-updated
+        stats = np.concatenate([self.stats, np.zeros((3, len(self.campaigns) - self.stats.shape[1], len(MEASURES)))], axis=1)
+        ok = ~np.isnan(vals)
+        x = np.where(ok, vals, 0.0)
+        np.add.at(stats[0], codes, ok.astype(float))
+        np.add.at(stats[1], codes, x)
+        np.add.at(stats[2], codes, x * x)
+        self.stats, self.codes, self.rater_codes, self.values, self.ids = (
+            stats, np.concatenate([self.codes, codes]), np.concatenate([self.rater_codes, rcodes]),
+            np.concatenate([self.values, vals]), np.concatenate([self.ids, ids.astype(object)]))
+        return self
+
+    def agreement(self) -> pd.DataFrame:
+        alpha, icc, k, n = _alpha_icc(*self.stats)
+        return pd.DataFrame({"measure": MEASURES, "krippendorff_alpha": alpha, "icc1": icc,
+                             "multi_rated_campaigns": k.astype(int), "pairable_ratings": n.astype(int)})
+
+    def _residuals(self):
+        m, s1 = self.stats[0], self.stats[1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = s1 / m
+        res = self.values - means[self.codes]
+        # only ratings of campaigns that more than one rating covers say anything about leniency
+        res[m[self.codes] < 2] = np.nan
+        return res
+
+    def leniency(self) -> pd.DataFrame:
+        # mean deviation of each rater from the campaign consensus, per measure (positive = lenient)
+        res = self._residuals()
+        ok = ~np.isnan(res)
+        nr = len(self.raters)
+        cnt = np.stack([np.bincount(self.rater_codes, ok[:, j], nr) for j in range(len(MEASURES))], axis=1)
+        tot = np.stack([np.bincount(self.rater_codes, np.where(ok[:, j], res[:, j], 0.0), nr) for j in range(len(MEASURES))], axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            off = tot / cnt
+        out = pd.DataFrame(off, columns=[f"{c}_offset" for c in MEASURES])
+        out.insert(0, "rater_id", self.raters)
+        out.insert(1, "n_ratings", np.bincount(self.rater_codes, minlength=nr))
+        out.insert(2, "n_overlapping", cnt[:, -1].astype(int))
+        return out.sort_values("CCR_offset", ascending=False, na_position="last").reset_index(drop=True)
+
+    def normalized_ccr(self) -> pd.DataFrame:
+        # per-campaign CCR after removing each rater's leniency offset (raters without overlap: no correction)
+        res = self._residuals()[:, -1]
+        ok = ~np.isnan(res)
+        nr = len(self.raters)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            off = np.bincount(self.rater_codes, np.where(ok, res, 0.0), nr) / np.bincount(self.rater_codes, ok, nr)
+        off = np.nan_to_num(off)
+        ccr = self.values[:, -1]
+        nc = len(self.campaigns)
+        n = np.bincount(self.codes, minlength=nc)
+        raw = np.bincount(self.codes, ccr, nc) / np.maximum(n, 1)
+        norm = np.bincount(self.codes, np.clip(ccr - off[self.rater_codes], 0.0, 100.0), nc) / np.maximum(n, 1)
+        out = pd.DataFrame({"campaign_id": self.campaigns, "n_ratings": n, "CCR_mean": raw, "CCR_normalized": norm})
+        out["shift"] = out["CCR_normalized"] - out["CCR_mean"]
+        return out.sort_values("CCR_normalized", ascending=False).reset_index(drop=True)
+
+_lock = threading.Lock()
+_engines = {}
+
+def engine(store=None) -> ReliabilityEngine:
+    # one engine per store; appended ratings are folded into a copy, anything else triggers a rebuild.
+    # Engines already handed out are never modified, so pages can read them without holding the lock.
+    store = store or get_store()
+    weights = get_weights()
+    key, version = (store.name, store.path), store.version()
+    with _lock:
+        hit = _engines.get(key)
+        if hit is not None and hit[0] == version and hit[1].weights == weights:
+            return hit[1]
+        df = store.load()
+        eng = hit[1] if hit is not None else None
+        n = len(eng) if eng is not None else 0
+        if eng is None or eng.weights != weights or len(df) < n or \
+                not np.array_equal(df["campaign_id"].astype(str).to_numpy()[:n], eng.ids.astype(str)):
+            eng, n = ReliabilityEngine(weights), 0
+        else:
+            eng = eng.copy()
+        eng.update(df.iloc[n:])
+        _engines[key] = (version, eng)
+        return eng
@@ -0,0 +1,222 @@
+import os, sqlite3, threading
+import numpy as np
+import pandas as pd
+from .algorithm import DIMENSIONS, FLAG_COLS, compute_ccr_batch, compute_ccr_single, get_weights
+from .core import _num
+from .storage import get_store, locked
+
+# CCR_campaign_aggregates.sqlite is a materialized view over the ratings: one row per campaign, keyed on
+# campaign_id, with running aggregates. It records the store version() it reflects. The first read that finds
+# it missing or behind the store (re)builds it from all ratings; save_rating() folds each new rating into its
+# campaign's row, one keyed upsert. The legacy CCR_results.csv is never touched.
+META_COLS = ["campaign_name","brand","channel","scene_audience","country","asset_youtube_url"]
+SCALED_COLS = [f"{d}_100" for d in DIMENSIONS]
+RESULTS_COLUMNS = ["campaign_id", *DIMENSIONS, *SCALED_COLS, *FLAG_COLS, "CCR_rater", *META_COLS, "CCR_mean", "n_ratings", "CCR_sum"]
+MEAN_COLS = [*DIMENSIONS, *FLAG_COLS]
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(columns=RESULTS_COLUMNS)
+
+def _finish(agg: pd.DataFrame) -> pd.DataFrame:
+    for d, s in zip(DIMENSIONS, SCALED_COLS):
+        agg[s] = (agg[d] - 1.0)/4.0*100.0
+    agg["CCR_mean"] = agg["CCR_sum"] / agg["n_ratings"]
+    return agg.reset_index()[RESULTS_COLUMNS]
+
+def _numeric(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({c: pd.to_numeric(df[c], errors="coerce") if c in df.columns else np.nan for c in MEAN_COLS}, index=df.index)
+
+def aggregate(chunks, weights: dict = None) -> pd.DataFrame:
+    weights = weights or get_weights()
+    sums, metas = [], []
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        ids = chunk["campaign_id"].astype(str)
+        part = _numeric(chunk).assign(campaign_id=ids, CCR_sum=compute_ccr_batch(chunk, weights), n_ratings=1)
+        g = part.groupby("campaign_id", sort=False)
+        sums.append(g[[*MEAN_COLS, "CCR_sum", "n_ratings"]].sum())
+        meta = chunk.reindex(columns=META_COLS).replace("", np.nan).assign(campaign_id=ids, CCR_rater=part["CCR_sum"])
+        metas.append(meta.groupby("campaign_id", sort=False).last())
+    if not sums:
+        return _empty()
+    total = pd.concat(sums).groupby(level=0, sort=False).sum()
+    meta = pd.concat(metas).groupby(level=0, sort=False).last()
+    for c in MEAN_COLS:
+        total[c] = total[c] / total["n_ratings"]
+    total = total.join(meta)
+    total.index.name = "campaign_id"
+    return _finish(total)
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    cols = ['"campaign_id" TEXT PRIMARY KEY'] + [f'"{c}" {"TEXT" if c in META_COLS else "REAL"}' for c in RESULTS_COLUMNS[1:]]
+    con.execute(f"CREATE TABLE IF NOT EXISTS campaigns ({', '.join(cols)})")
+    con.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v)")
+    return con
+
+def _meta(con, k):
+    r = con.execute("SELECT v FROM meta WHERE k = ?", (k,)).fetchone()
+    return r[0] if r else None
+
+_SQL_COLS = ", ".join(f'"{c}"' for c in RESULTS_COLUMNS)
+# an upsert (not INSERT OR REPLACE) keeps a campaign's rowid, i.e. its place in the table
+_INSERT = f"INSERT INTO campaigns ({_SQL_COLS}) VALUES ({', '.join('?' * len(RESULTS_COLUMNS))}) " \
+          f"ON CONFLICT (campaign_id) DO UPDATE SET " + ", ".join(f'"{c}" = excluded."{c}"' for c in RESULTS_COLUMNS[1:])
+
+def _rows(df: pd.DataFrame):
+    df = df[RESULTS_COLUMNS].astype(object)
+    return df.where(pd.notna(df), None).itertuples(index=False, name=None)
+
+def _written(con, version):
+    # every write records the store version it reflects and bumps gen, which keys the load() cache
+    con.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?), ('gen', COALESCE((SELECT v FROM meta WHERE k = 'gen'), 0) + 1)",
+                (repr(version),))
+
+def rebuild(path, store=None, chunksize: int = 100_000) -> pd.DataFrame:
+    store = store or get_store()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a") as lf, locked(lf):
+        version = store.version()
+        agg = aggregate(store.iter_chunks(chunksize))
+        if store.version() != version:
+            version = None  # written to while aggregating; the next read rebuilds again
+        con = _connect(path)
+        try:
+            with con:
+                con.execute("DELETE FROM campaigns")
+                con.executemany(_INSERT, _rows(agg))
+                _written(con, version)
+        finally:
+            con.close()
+    return agg
+
+_lock = threading.Lock()
+_cache = {}
+
+def load(path) -> pd.DataFrame:
+    # the stored table as it is (possibly behind the ratings, see load_current); shared, treat as read-only
+    if not os.path.exists(path):
+        return _empty()
+    con = _connect(path)
+    try:
+        con.execute("BEGIN")  # one snapshot for gen and the rows
+        gen = _meta(con, "gen")
+        with _lock:
+            hit = _cache.get(os.path.abspath(path))
+            if hit is not None and hit[0] == gen:
+                return hit[1]
+        df = pd.read_sql_query(f"SELECT {_SQL_COLS} FROM campaigns ORDER BY rowid", con)
+    finally:
+        con.close()
+    for c in META_COLS:
+        df[c] = df[c].astype(object)
+    with _lock:
+        _cache[os.path.abspath(path)] = (gen, df)
+    return df
+
+def is_current(path, store=None) -> bool:
+    if not os.path.exists(path):
+        return False
+    con = _connect(path)
+    try:
+        return _meta(con, "version") == repr((store or get_store()).version())
+    finally:
+        con.close()
+
+def load_current(path, store=None) -> pd.DataFrame:
+    # the table, built or brought up to date first if the ratings moved on without it (first use, bulk import)
+    store = store or get_store()
+    if not is_current(path, store):
+        rebuild(path, store)
+    return load(path)
+
+def update(row: dict, path, store=None, before=None, after=None, weights: dict = None) -> bool:
+    # Fold one freshly saved rating into its campaign's row: one keyed read and upsert, however many campaigns.
+    # before/after are the store versions around its append. Only a table that reflected exactly `before` is
+    # updated; otherwise it is left behind and the next load_current() rebuilds it.
+    if not os.path.exists(path):
+        return False
+    weights = weights or get_weights()
+    ccr = float(compute_ccr_single(row, weights, row))  # scalar path: a one-row frame costs ms in pandas
+    x = {c: float(v) if v == v else 0.0 for c, v in ((c, _num(row.get(c))) for c in MEAN_COLS)}
+    cid = str(row.get("campaign_id", ""))
+    with open(path + ".lock", "a") as lf, locked(lf):
+        con = _connect(path)
+        try:
+            with con:
+                version, gen = _meta(con, "version"), _meta(con, "gen")
+                if version == repr(after):
+                    return True  # rebuilt after the append; the rating is already in
+                if version != repr(before):
+                    return False
+                r = con.execute(f"SELECT {_SQL_COLS} FROM campaigns WHERE campaign_id = ?", (cid,)).fetchone()
+                if r is None:
+                    rec = {**dict.fromkeys(RESULTS_COLUMNS), "campaign_id": cid, **x, "n_ratings": 1, "CCR_sum": ccr}
+                else:
+                    rec = dict(zip(RESULTS_COLUMNS, r))
+                    n = float(rec["n_ratings"])
+                    for c in MEAN_COLS:
+                        rec[c] = (float(rec[c] or 0.0) * n + x[c]) / (n + 1)
+                    rec["n_ratings"] = n + 1
+                    rec["CCR_sum"] = float(rec["CCR_sum"]) + ccr
+                for c in META_COLS:
+                    v = row.get(c)
+                    if v is not None and not (isinstance(v, float) and np.isnan(v)) and str(v) != "":
+                        rec[c] = str(v)
+                rec["CCR_rater"] = ccr
+                rec["CCR_mean"] = rec["CCR_sum"] / rec["n_ratings"]
+                for d, sc in zip(DIMENSIONS, SCALED_COLS):
+                    rec[sc] = (rec[d] - 1.0)/4.0*100.0
+                con.execute(_INSERT, [rec[c] for c in RESULTS_COLUMNS])
+                _written(con, after)
+            _patch_cache(path, gen, rec)
+        finally:
+            con.close()
+    return True
+
+def _patch_cache(path, gen, rec: dict):
+    # apply an update to a copy of the cached table too, so the next load() after a save is not a full re-read
+    key = os.path.abspath(path)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is None or hit[0] != gen:
+            return
+        df = hit[1]
+        i = np.flatnonzero(df["campaign_id"].to_numpy() == rec["campaign_id"])
+        if len(i):
+            df = df.copy()
+            for j, c in enumerate(RESULTS_COLUMNS):  # iat: a whole-row assignment is ~10x slower
+                df.iat[i[0], j] = rec[c]
+        else:
+            new = pd.DataFrame([rec], columns=RESULTS_COLUMNS).astype({c: object for c in META_COLS})
+            df = pd.concat([df, new], ignore_index=True) if len(df) else new
+        _cache[key] = ((gen or 0) + 1, df)
+
+def check(path, store=None, rtol: float = 1e-9) -> list:
+    # Compares the stored (incrementally maintained) table against a full re-aggregation.
+    # Returns a list of human readable differences; empty means consistent.
+    if not os.path.exists(path):
+        return [f"{path} does not exist yet; it is built on first use or by python -m ccr results rebuild"]
+    have = load(path)
+    want = aggregate((store or get_store()).iter_chunks())
+    if list(have.columns) != RESULTS_COLUMNS:
+        return [f"unexpected columns in {path}"]
+    have, want = have.set_index("campaign_id"), want.set_index("campaign_id")
+    have.index, want.index = have.index.astype(str), want.index.astype(str)
+    problems = [f"{c}: missing from results" for c in want.index.difference(have.index)]
+    problems += [f"{c}: has no ratings" for c in have.index.difference(want.index)]
+    common = want.index.intersection(have.index)
+    num = [c for c in RESULTS_COLUMNS[1:] if c not in META_COLS]
+    a = have.loc[common, num].astype(float).to_numpy()
+    b = want.loc[common, num].astype(float).to_numpy()
+    bad = ~np.isclose(a, b, rtol=rtol, atol=1e-9, equal_nan=True)
+    for r, c in zip(*np.nonzero(bad)):
+        problems.append(f"{common[r]}: {num[c]} is {a[r, c]!r}, expected {b[r, c]!r}")
+    for c in META_COLS:
+        x, y = have.loc[common, c], want.loc[common, c]
+        diff = ~((x.astype(str) == y.astype(str)) | (x.isna() & y.isna()))
+        problems += [f"{k}: {c} is {x[k]!r}, expected {y[k]!r}" for k in common[diff.to_numpy()]]
+    return problems
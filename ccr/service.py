@@ -0,0 +1,184 @@
+# Small HTTP/1.1 JSON scoring service on plain asyncio, built on ccr.core only (no pandas/streamlit).
+#   GET  /health        -> {"status": "ok", ...}
+#   GET  /weights       -> the weights currently in use
+#   POST /score         -> {"scores": {...}, "flags": {...}} or one flat record  => {"ccr": float}
+#   POST /score/batch   -> {"records": [...]} or a bare list of records          => {"ccr": [float, ...]}
+# Connections are kept alive, concurrent /score requests are micro-batched into one vectorized pass,
+# and the weights JSON is re-read whenever its mtime changes (no restart needed).
+import asyncio, json, os, time
+import numpy as np
+from .core import DIMENSIONS, FLAG_COLS, WEIGHTS_JSON, _num, compute_ccr_array, get_weights
+
+MAX_HEADER = 16 * 1024
+MAX_BODY = 64 * 1024 * 1024
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+def _split(record: dict):
+    if not isinstance(record, dict):
+        raise HttpError(400, "each record must be a JSON object")
+    if "scores" in record or "flags" in record:
+        scores, flags = record.get("scores") or {}, record.get("flags") or {}
+        if not isinstance(scores, dict) or not isinstance(flags, dict):
+            raise HttpError(400, '"scores" and "flags" must be JSON objects')
+        return scores, flags
+    return record, record
+
+def _matrix(rows, cols, default):
+    vals = [[r.get(c, default) for c in cols] for r in rows]
+    try:
+        return np.array(vals, dtype=float).reshape(len(rows), len(cols))
+    except (TypeError, ValueError):  # strings / nulls: coerce cell by cell like the scalar path
+        return np.array([[_num(v) for v in row] for row in vals], dtype=float).reshape(len(rows), len(cols))
+
+def records_to_arrays(records):
+    pairs = [_split(r) for r in records]
+    sm = _matrix([p[0] for p in pairs], DIMENSIONS, 3.0)
+    fm = _matrix([p[1] for p in pairs], FLAG_COLS, 0.0)
+    fm[np.isnan(fm)] = 0.0
+    return sm, fm
+
+class Scorer:
+    def __init__(self, weights_path: str = None, max_batch: int = 256, max_wait_ms: float = 2.0):
+        # same resolution as get_weights(): explicit path, then $CCR_WEIGHTS, then the default file
+        self.weights_path = weights_path or os.environ.get("CCR_WEIGHTS") or WEIGHTS_JSON
+        self.max_batch, self.max_wait = max_batch, max_wait_ms / 1e3
+        self.queue = asyncio.Queue()
+        self.batches = self.batched_items = 0
+
+    @property
+    def weights(self) -> dict:
+        return get_weights(self.weights_path)
+
+    def score(self, records) -> list:
+        sm, fm = records_to_arrays(records)
+        out = compute_ccr_array(sm, self.weights, fm)
+        return [None if np.isnan(v) else float(v) for v in out]
+
+    async def submit(self, record) -> float:
+        records_to_arrays([record])  # validate before queueing so one bad record can't fail a batch
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, fut))
+        return await fut
+
+    async def run(self):
+        # collects single-score requests for up to max_wait (or max_batch items) and scores them together
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                scores = self.score([rec for rec, _ in items])
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done(): fut.set_exception(e)
+                continue
+            self.batches += 1; self.batched_items += len(items)
+            for (_, fut), v in zip(items, scores):
+                if not fut.done(): fut.set_result(v)
+
+class Service:
+    def __init__(self, scorer: Scorer):
+        self.scorer = scorer
+        self.started = time.time()
+        self.requests = 0
+
+    async def route(self, method: str, path: str, body: bytes):
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/health":
+            return {"status": "ok", "uptime_s": round(time.time() - self.started, 1), "requests": self.requests,
+                    "micro_batches": self.scorer.batches, "micro_batched_requests": self.scorer.batched_items}
+        if path == "/weights":
+            return self.scorer.weights
+        if path not in ("/score", "/score/batch"):
+            raise HttpError(404, f"no route for {path}")
+        if method != "POST":
+            raise HttpError(405, f"{path} expects POST")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError as e:
+            raise HttpError(400, f"invalid JSON: {e}")
+        if path == "/score":
+            return {"ccr": await self.scorer.submit(payload)}
+        records = payload.get("records") if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            raise HttpError(400, "expected a list of records or {\"records\": [...]}")
+        return {"ccr": self.scorer.score(records)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 413, {"error": "headers too large"}, False)
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._send(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                conn = headers.get("connection", "").lower()
+                keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+                raw = headers.get("content-length") or "0"
+                if not (raw.isascii() and raw.isdigit()):  # also rejects negative values, which readexactly() would choke on
+                    await self._send(writer, 400, {"error": f"invalid Content-Length: {raw}"}, False)
+                    break
+                length = int(raw)
+                if length > MAX_BODY:
+                    await self._send(writer, 413, {"error": "body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+                try:
+                    status, payload = 200, await self.route(method.upper(), target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, weights_path: str = None, max_batch: int = 256, max_wait_ms: float = 2.0):
+    scorer = Scorer(weights_path, max_batch, max_wait_ms)
+    service = Service(scorer)
+    batcher = asyncio.create_task(scorer.run())
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER)
+    print(f"CCR scoring service on http://{host}:{port} (weights: {scorer.weights_path})", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher.cancel()
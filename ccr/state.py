@@ -1,18 +1,20 @@
 from datetime import date
 import streamlit as st
 from .algorithm import DIMENSIONS
-from .data_io import load_ratings, next_campaign_id
+from .data_io import peek_campaign_id
 
 CHANNEL_OPTIONS = ["TikTok","Instagram","YouTube","OOH","TV","Radio","Integrated","Other"]
+RATER_OPTIONS = ["Lode","Maarten"]
 AUDIENCE_OPTIONS = ["BE urban 16-24","BE Gen Z 18-24","BE mainstream 25-44","NL mainstream 25-44","EU mainstream 25-44","FR urban 18-34","DE mainstream 18-49","Other..."]
 
 def init_state():
     if "step" not in st.session_state:
         st.session_state.step = "Campaign Information"
     if "info" not in st.session_state:
-        df0 = load_ratings()
+        suggested = peek_campaign_id()  # only taken on save, so sessions that never save use up no id
         st.session_state.info = {
-            "campaign_id": next_campaign_id(df0),
+            "campaign_id": suggested,
+            "campaign_id_suggested": suggested,
             "campaign_name": "",
             "brand": "",
             "channel": CHANNEL_OPTIONS[0],
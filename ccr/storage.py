@@ -0,0 +1,440 @@
+import glob, io, os, sqlite3, threading, time, uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+import pandas as pd
+from .algorithm import DIMENSIONS, FLAG_COLS
+from .perf import annotate, span
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, appends stay single-writer
+    fcntl = None
+
+TEXT_COLS = ["campaign_id","rater_id","rater_notes",
+             "campaign_name","brand","channel","scene_audience","country","submit_date_iso","asset_youtube_url"]
+RATING_COLUMNS = [*TEXT_COLS, *DIMENSIONS, *FLAG_COLS]
+INDEXED_COLS = ["campaign_id","rater_id","brand","channel","submit_date_iso"]
+FILTER_COLS = ["campaign_id","rater_id","brand","channel","country"]
+CSV_DTYPES = {c: str for c in TEXT_COLS}  # ids like "007" stay text, as in the sqlite/parquet stores
+_SQL_COLS = ", ".join(f'"{c}"' for c in RATING_COLUMNS)
+
+@contextmanager
+def locked(f, shared=False):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    try:
+        yield f
+    finally:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _date_range(since=None, until=None, days=None):
+    if days is not None:
+        since = max(since or "", str(date.today() - timedelta(days=int(days))))
+    return since or None, until or None
+
+def filter_frame(df: pd.DataFrame, since=None, until=None, days=None, **eq) -> pd.DataFrame:
+    since, until = _date_range(since, until, days)
+    mask = pd.Series(True, index=df.index)
+    for c, v in eq.items():
+        if v is not None and c in df.columns:
+            mask &= df[c].astype(str) == str(v)
+    if (since or until) and "submit_date_iso" in df.columns:
+        d = df["submit_date_iso"].astype(str)
+        if since: mask &= d >= since
+        if until: mask &= d <= until
+    return df if mask.all() else df[mask].reset_index(drop=True)
+
+def _check_filters(eq: dict):
+    bad = set(eq) - set(FILTER_COLS)
+    if bad:
+        raise TypeError(f"unsupported filter(s): {', '.join(sorted(bad))}")
+
+class _Entry:
+    __slots__ = ("ident", "size", "mtime", "df", "guard")
+
+    def __init__(self, ident, size, mtime, df, guard):
+        self.ident, self.size, self.mtime, self.df, self.guard = ident, size, mtime, df, guard
+
+class CsvCache:
+    # Process-wide parsed-CSV cache shared by every Streamlit session/rerun. Entries are keyed on
+    # (device, inode, size, mtime); a file that only grew is extended by parsing the appended tail.
+    GUARD = 64
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = self.misses = self.tail_parses = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "tail_parses": self.tail_parses, "entries": len(self._entries)}
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None: self._entries.clear()
+            else: self._entries.pop(os.path.abspath(path), None)
+
+    def get(self, path) -> pd.DataFrame:
+        key = os.path.abspath(path)
+        with self._lock, open(path, "rb") as f, locked(f, shared=True):
+            st = os.fstat(f.fileno())
+            ident, e = (st.st_dev, st.st_ino), self._entries.get(key)
+            if e is not None and e.ident == ident and e.size == st.st_size and e.mtime == st.st_mtime_ns:
+                self.hits += 1
+                return e.df
+            df = None
+            if e is not None:
+                with span("csv_tail_parse", bytes=st.st_size - e.size):
+                    df = self._tail(f, e, ident, st.st_size)
+            if df is None:
+                self.misses += 1
+                f.seek(0)
+                with span("csv_parse", bytes=st.st_size):
+                    try:
+                        df = pd.read_csv(f, dtype=CSV_DTYPES)
+                    except Exception:
+                        df = pd.DataFrame(columns=RATING_COLUMNS)
+                    annotate(rows=len(df))
+            else:
+                self.tail_parses += 1
+            f.seek(max(0, st.st_size - self.GUARD))
+            self._entries[key] = _Entry(ident, st.st_size, st.st_mtime_ns, df, f.read(self.GUARD))
+            return df
+
+    def _tail(self, f, e, ident, size):
+        if e.ident != ident or size < e.size:
+            return None
+        # the bytes just before the old end must be unchanged, otherwise the file was rewritten
+        f.seek(max(0, e.size - len(e.guard)))
+        if f.read(len(e.guard)) != e.guard:
+            return None
+        data = f.read(size - e.size)
+        if not data.strip():
+            return e.df
+        # parse the tail with the cached frame's dtypes so the result matches a cold parse; if the tail
+        # does not fit them (e.g. a blank in an int column) fall back to a full parse
+        dtype = dict(e.df.dtypes) if len(e.df) else CSV_DTYPES
+        try:
+            tail = pd.read_csv(io.BytesIO(data), header=None, names=list(e.df.columns), dtype=dtype)
+        except Exception:
+            return None
+        return tail if e.df.empty else pd.concat([e.df, tail], ignore_index=True)
+
+csv_cache = CsvCache()
+
+class CsvStore:
+    name = "csv"
+
+    def __init__(self, path):
+        self.path = path
+
+    def ensure(self):
+        d = os.path.dirname(self.path)
+        if d: os.makedirs(d, exist_ok=True)
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "a+b") as f, locked(f):
+                if os.fstat(f.fileno()).st_size == 0:
+                    f.write(pd.DataFrame(columns=RATING_COLUMNS).to_csv(index=False).encode("utf-8"))
+                    f.flush(); os.fsync(f.fileno())
+
+    def load(self, since=None, until=None, days=None, **eq) -> pd.DataFrame:
+        _check_filters(eq)
+        self.ensure()
+        cached = csv_cache.get(self.path)
+        df = filter_frame(cached, since, until, days, **eq)
+        # the cached frame is shared across sessions; hand out a private copy
+        return df.copy() if df is cached else df
+
+    def count(self, since=None, until=None, days=None, **eq) -> int:
+        _check_filters(eq)
+        self.ensure()
+        return len(filter_frame(csv_cache.get(self.path), since, until, days, **eq))
+
+    def iter_chunks(self, chunksize=100_000):
+        self.ensure()
+        yield from pd.read_csv(self.path, chunksize=chunksize, dtype=CSV_DTYPES)
+
+    def version(self):
+        return file_version(self.path)
+
+    def _header(self, f) -> list:
+        f.seek(0)
+        return pd.read_csv(io.BytesIO(f.readline()), nrows=0).columns.tolist()
+
+    def append(self, rows):
+        # -> (version() before, version() after), both taken under the write lock
+        self.ensure()
+        with open(self.path, "a+b") as f, locked(f):
+            before = self.version()
+            cols = self._header(f) or RATING_COLUMNS
+            data = pd.DataFrame(rows, columns=cols).to_csv(index=False, header=False).encode("utf-8")
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush(); os.fsync(f.fileno())
+            return before, self.version()
+
+class SqliteStore:
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._ready = False
+
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    def ensure(self):
+        if self._ready:
+            return
+        d = os.path.dirname(self.path)
+        if d: os.makedirs(d, exist_ok=True)
+        cols = [f'"{c}" TEXT' for c in TEXT_COLS] + [f'"{c}" REAL' for c in DIMENSIONS] \
+             + [f'"{c}" INTEGER' for c in FLAG_COLS[:-1]] + [f'"{FLAG_COLS[-1]}" REAL']
+        with self._connect() as con:
+            con.execute(f"CREATE TABLE IF NOT EXISTS ratings (id INTEGER PRIMARY KEY, {', '.join(cols)})")
+            for c in INDEXED_COLS:
+                con.execute(f'CREATE INDEX IF NOT EXISTS ix_ratings_{c} ON ratings ("{c}")')
+            con.execute('CREATE INDEX IF NOT EXISTS ix_ratings_brand_date ON ratings (brand, submit_date_iso)')
+        con.close()
+        self._ready = True
+
+    def _where(self, since, until, days, eq):
+        _check_filters(eq)
+        self.ensure()
+        since, until = _date_range(since, until, days)
+        where, args = [], []
+        for c, v in eq.items():
+            if v is not None:
+                where.append(f'"{c}" = ?'); args.append(str(v))
+        if since: where.append("submit_date_iso >= ?"); args.append(since)
+        if until: where.append("submit_date_iso <= ?"); args.append(until)
+        return (" WHERE " + " AND ".join(where) if where else ""), args
+
+    def load(self, since=None, until=None, days=None, **eq) -> pd.DataFrame:
+        where, args = self._where(since, until, days, eq)
+        con = self._connect()
+        try:
+            return pd.read_sql_query(f"SELECT {_SQL_COLS} FROM ratings{where} ORDER BY id", con, params=args)
+        finally:
+            con.close()
+
+    def count(self, since=None, until=None, days=None, **eq) -> int:
+        where, args = self._where(since, until, days, eq)
+        con = self._connect()
+        try:
+            return con.execute(f"SELECT COUNT(*) FROM ratings{where}", args).fetchone()[0]
+        finally:
+            con.close()
+
+    def iter_chunks(self, chunksize=100_000):
+        self.ensure()
+        con = self._connect()
+        try:
+            yield from pd.read_sql_query(f"SELECT {_SQL_COLS} FROM ratings ORDER BY id", con, chunksize=chunksize)
+        finally:
+            con.close()
+
+    def _version(self, con):
+        # rows are only ever appended, so the highest id identifies the content; file stats would not (opening
+        # a connection creates the -wal file, checkpoints rewrite the database). The inode catches a replaced file.
+        return os.stat(self.path).st_ino, con.execute("SELECT MAX(id) FROM ratings").fetchone()[0]
+
+    def version(self):
+        if not os.path.exists(self.path):
+            return None
+        self.ensure()
+        con = self._connect()
+        try:
+            return self._version(con)
+        finally:
+            con.close()
+
+    def append(self, rows):
+        self.ensure()
+        df = pd.DataFrame(rows, columns=RATING_COLUMNS).astype(object)
+        df = df.where(pd.notna(df), None)
+        con = self._connect()
+        # the side lock spans the commit, so no other writer lands between the two versions
+        with open(self.path + ".lock", "a") as lf, locked(lf):
+            try:
+                before = self._version(con)
+                with con:
+                    con.executemany(f"INSERT INTO ratings ({_SQL_COLS}) VALUES ({', '.join('?' * len(RATING_COLUMNS))})",
+                                    df.itertuples(index=False, name=None))
+                return before, self._version(con)
+            finally:
+                con.close()
+
+class ParquetStore:
+    name = "parquet"
+    # every append writes a part file; once this many uncompacted parts pile up they are merged into one,
+    # and once this many parts exist in total everything is compacted, so reads stay O(COMPACT_AFTER) files
+    COMPACT_AFTER = 64
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def _pa():
+        try:
+            import pyarrow as pa, pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("the parquet backend needs pyarrow (pip install pyarrow)") from e
+        return pa, pq
+
+    def _schema(self):
+        pa, _ = self._pa()
+        return pa.schema([(c, pa.string()) for c in TEXT_COLS] + [(c, pa.float64()) for c in DIMENSIONS + FLAG_COLS])
+
+    def _typed(self, df: pd.DataFrame):
+        pa, _ = self._pa()
+        df = df.reindex(columns=RATING_COLUMNS)
+        for c in TEXT_COLS:
+            df[c] = df[c].astype(object).where(df[c].notna(), None).map(lambda v: v if v is None else str(v))
+        for c in DIMENSIONS + FLAG_COLS:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype(float)
+        return pa.Table.from_pandas(df, schema=self._schema(), preserve_index=False)
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "*.parquet")))
+
+    @contextmanager
+    def _locked(self, shared=False):
+        # readers share it; appends and compaction take it exclusively, so nobody sees a half-swapped set of parts
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".lock", "a") as lf, locked(lf, shared=shared):
+            yield
+
+    def _filters(self, since, until, days, eq):
+        _check_filters(eq)
+        since, until = _date_range(since, until, days)
+        flt = [(c, "=", str(v)) for c, v in eq.items() if v is not None]
+        if since: flt.append(("submit_date_iso", ">=", since))
+        if until: flt.append(("submit_date_iso", "<=", until))
+        return flt or None
+
+    def load(self, since=None, until=None, days=None, **eq) -> pd.DataFrame:
+        flt = self._filters(since, until, days, eq)
+        _, pq = self._pa()
+        with self._locked(shared=True):
+            parts = self._parts()
+            if not parts:
+                return pd.DataFrame(columns=RATING_COLUMNS)
+            table = pq.read_table(parts, schema=self._schema(), filters=flt)
+        return table.to_pandas()
+
+    def count(self, since=None, until=None, days=None, **eq) -> int:
+        flt = self._filters(since, until, days, eq)
+        _, pq = self._pa()
+        with self._locked(shared=True):
+            parts = self._parts()
+            if not parts:
+                return 0
+            cols = sorted({"campaign_id", *(f[0] for f in flt or ())})
+            return pq.read_table(parts, schema=self._schema(), columns=cols, filters=flt).num_rows
+
+    def iter_chunks(self, chunksize=100_000):
+        _, pq = self._pa()
+        with self._locked(shared=True):
+            files = [pq.ParquetFile(p) for p in self._parts()]  # open handles survive a later compaction
+        for f in files:
+            for batch in f.iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+
+    def version(self):
+        return file_version(self.path)
+
+    def append(self, rows):
+        # -> (version() before, version() after), both taken under the write lock
+        _, pq = self._pa()
+        os.makedirs(self.path, exist_ok=True)
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=RATING_COLUMNS)
+        # one immutable part file per append; compact() folds them back together. The dot-file is
+        # invisible to readers and to version() until it is renamed under the lock.
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = os.path.join(self.path, "." + name)
+        pq.write_table(self._typed(df), tmp)
+        with self._locked():
+            before = self.version()
+            os.replace(tmp, os.path.join(self.path, name))
+            parts = self._parts()
+            small = [p for p in parts if not p.endswith("-compact.parquet")]
+            if len(small) >= self.COMPACT_AFTER:
+                self._compact(small)
+            elif len(parts) >= self.COMPACT_AFTER:
+                self._compact(None)
+            return before, self.version()
+
+    def compact(self, parts=None, row_group_size=100_000):
+        # parts=None: rewrite the whole store sorted; otherwise merge just those parts, in place of the first
+        with self._locked():
+            self._compact(parts, row_group_size)
+
+    def _compact(self, parts, row_group_size=100_000):
+        _, pq = self._pa()
+        full = parts is None
+        parts = [p for p in (self._parts() if full else parts) if os.path.exists(p)]
+        if len(parts) <= 1:
+            return
+        df = pq.read_table(parts, schema=self._schema()).to_pandas()
+        if full:
+            # sorting gives tight row-group statistics, so brand/date filters skip most groups
+            df = df.sort_values(["brand", "submit_date_iso"], kind="stable", na_position="last")
+            name = f"part-{time.time_ns():020d}-compact.parquet"
+        else:
+            name = os.path.basename(parts[0])[:-len(".parquet")] + "-compact.parquet"
+        tmp = os.path.join(self.path, "." + name)
+        pq.write_table(self._typed(df), tmp, row_group_size=row_group_size)
+        os.replace(tmp, os.path.join(self.path, name))
+        for p in parts:
+            os.remove(p)
+
+def file_version(path):
+    # cheap change token for a CSV file or parquet directory; None if it does not exist yet. Stores expose
+    # it as store.version() (SQLite has its own, see SqliteStore._version)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if os.path.isdir(path):
+        # part files are immutable and uniquely named, so the visible names identify the content; dot-files
+        # are writes in progress, and the directory mtime changes whenever one is created
+        return st.st_ino, tuple(sorted(n for n in os.listdir(path) if not n.startswith(".")))
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+BACKENDS = {"csv": CsvStore, "sqlite": SqliteStore, "parquet": ParquetStore}
+
+def store_path(backend: str, data_dir="data") -> str:
+    return os.path.join(data_dir, {"csv": "CCR_ratings.csv", "sqlite": "CCR_ratings.sqlite", "parquet": "CCR_ratings.parquet"}[backend])
+
+def make_store(backend: str, path=None, data_dir="data"):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown storage backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[backend](path or store_path(backend, data_dir))
+
+_store = None
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = make_store(os.environ.get("CCR_STORAGE", "csv"))
+    return _store
+
+def set_store(store):
+    global _store
+    _store = store
+
+def migrate(src, dst, chunksize=100_000) -> int:
+    n = 0
+    for chunk in src.iter_chunks(chunksize):
+        if len(chunk):
+            dst.append(chunk.reindex(columns=RATING_COLUMNS))
+            n += len(chunk)
+    return n
@@ -1,8 +1,9 @@
 import streamlit as st
-from .algorithm import DEFAULT_WEIGHTS, DIMENSIONS, FLAG_COLS, LABELS, live_ccr_preview
-from .state import CHANNEL_OPTIONS, AUDIENCE_OPTIONS
-from .data_io import load_ratings, save_rating, next_campaign_id
+from .algorithm import DIMENSIONS, LABELS, live_ccr_preview
+from .state import CHANNEL_OPTIONS, AUDIENCE_OPTIONS, RATER_OPTIONS
+from .data_io import count_ratings, load_results, ratings_page, save_rating, next_campaign_id, peek_campaign_id
 from .components import youtube_iframe
+from .perf import span
 
 def inject_css():
     st.markdown("""
@@ -82,7 +83,8 @@ def stepper():
                                          index=["Campaign Information","Evaluation","Results"].index(st.session_state.step), horizontal=True)
 
 def panel_fixed_right():
-    live = live_ccr_preview(st.session_state.scores, st.session_state.risks)
+    with span("live_ccr_preview"):
+        live = live_ccr_preview(st.session_state.scores, st.session_state.risks)
     html = f"""
     <div id="fixed-live-panel">
       <h3 style="margin-top:0;">Live CCR</h3>
@@ -112,8 +114,8 @@ def page_campaign_info():
             st.session_state.info["scene_audience_custom"] = st.text_input("Custom audience", value=st.session_state.info["scene_audience_custom"])
         st.session_state.info["country"] = st.text_input("Country", value=st.session_state.info["country"])
         st.session_state.info["submit_date_iso"] = st.text_input("Date (YYYY-MM-DD)", value=st.session_state.info["submit_date_iso"])
-        st.session_state.info["rater_id"] = st.selectbox("Rater", ["Lode","Maarten"],
-                            index=["Lode","Maarten"].index(st.session_state.info["rater_id"]) if st.session_state.info["rater_id"] in ["Lode","Maarten"] else 0)
+        st.session_state.info["rater_id"] = st.selectbox("Rater", RATER_OPTIONS,
+                            index=RATER_OPTIONS.index(st.session_state.info["rater_id"]) if st.session_state.info["rater_id"] in RATER_OPTIONS else 0)
     st.session_state.info["asset_youtube_url"] = st.text_input("YouTube URL (optional)",
                         value=st.session_state.info["asset_youtube_url"], placeholder="https://www.youtube.com/watch?v=...")
     st.session_state.info["rater_notes"] = st.text_area("Rater notes", value=st.session_state.info["rater_notes"],
@@ -136,9 +138,11 @@ def sliders_and_risks():
 
 def page_evaluation():
     st.subheader("Evaluation")
-    panel_fixed_right()
+    with span("panel_fixed_right"):
+        panel_fixed_right()
     st.markdown('<div id="left-params">', unsafe_allow_html=True)
-    sliders_and_risks()
+    with span("sliders_and_risks"):
+        sliders_and_risks()
     st.markdown("</div>", unsafe_allow_html=True)
     if st.button("Save evaluation", type="primary"):
         info = st.session_state.info
@@ -149,14 +153,65 @@ def page_evaluation():
                **st.session_state.scores, **st.session_state.risks}
         if not row["campaign_id"]: st.error("Campaign ID is required.")
         else:
-            save_rating(row); df_after = load_ratings()
-            st.session_state.info["campaign_id"] = next_campaign_id(df_after)
-            st.success("Saved. Moving to Results…"); st.session_state.step = "Results"; st.rerun()
+            if row["campaign_id"] == info.get("campaign_id_suggested"):
+                # the form showed a peeked id; take one for real now (another session may have saved since)
+                row["campaign_id"] = next_campaign_id()
+            with span("save_rating"):
+                save_rating(row)
+            info["campaign_id"] = info["campaign_id_suggested"] = peek_campaign_id()
+            st.success(f"Saved as {row['campaign_id']}. Moving to Results…"); st.session_state.step = "Results"; st.rerun()
+
+RESULTS_PAGE_SIZE = 50
+SORT_OPTIONS = {"CCR (high → low)": "ccr_desc", "CCR (low → high)": "ccr_asc", "Newest first": "newest", "Oldest first": "oldest"}
+
+def results_filters() -> dict:
+    f1, f2, f3, f4, f5, f6 = st.columns(6)
+    with f1: brand = st.text_input("Brand", key="rf_brand").strip()
+    with f2: channel = st.selectbox("Channel", ["All", *CHANNEL_OPTIONS], key="rf_channel")
+    with f3: rater = st.selectbox("Rater", ["All", *RATER_OPTIONS], key="rf_rater")
+    with f4: country = st.text_input("Country", key="rf_country").strip()
+    with f5: since = st.date_input("From", value=None, key="rf_since")
+    with f6: until = st.date_input("To", value=None, key="rf_until")
+    filters = {"brand": brand or None, "channel": None if channel == "All" else channel,
+               "rater_id": None if rater == "All" else rater, "country": country or None,
+               "since": str(since) if since else None, "until": str(until) if until else None}
+    if st.session_state.get("results_filters") != filters:
+        st.session_state.results_filters = filters
+        st.session_state.results_page = 1
+    return filters
 
 def page_results():
     st.subheader("Results")
-    st.markdown("**Dataset (all evaluations)**")
-    st.dataframe(load_ratings(), use_container_width=True)
+    with span("load_results"):
+        res = load_results().sort_values("CCR_mean", ascending=False, kind="stable")
+    # one row per campaign can be large too: only the current page goes over the websocket
+    cpages = max(1, -(-len(res) // RESULTS_PAGE_SIZE))
+    st.session_state.campaigns_page = min(st.session_state.get("campaigns_page", 1), cpages)
+    c1, c2 = st.columns([4, 1])
+    with c1: st.markdown(f"**Campaigns ({len(res):,} campaigns, {int(res['n_ratings'].sum()):,} evaluations)** · "
+                         f"page {st.session_state.campaigns_page} of {cpages}")
+    with c2: st.number_input("Campaigns page", min_value=1, max_value=cpages, key="campaigns_page", label_visibility="collapsed")
+    start = (st.session_state.campaigns_page - 1) * RESULTS_PAGE_SIZE
+    page = res.iloc[start:start + RESULTS_PAGE_SIZE]
+    with span("st.dataframe", table="results", rows=len(page)):
+        st.dataframe(page, use_container_width=True, hide_index=True)
+
+    st.markdown("**Evaluations**")
+    filters = results_filters()
+    with span("count_ratings"):
+        total = count_ratings(**filters)
+    pages = max(1, -(-total // RESULTS_PAGE_SIZE))
+    st.session_state.results_page = min(st.session_state.get("results_page", 1), pages)
+    c1, c2, c3 = st.columns([2, 2, 1])
+    with c1: st.markdown(f"{total:,} matching evaluations · page {st.session_state.results_page} of {pages}")
+    with c2: sort = st.selectbox("Sort by", list(SORT_OPTIONS), key="rf_sort", label_visibility="collapsed")
+    with c3: st.number_input("Page", min_value=1, max_value=pages, key="results_page", label_visibility="collapsed")
+    if total:
+        with span("ratings_page"):
+            rows = ratings_page(st.session_state.results_page, RESULTS_PAGE_SIZE, SORT_OPTIONS[sort], **filters)
+        with span("st.dataframe", table="evaluations", rows=len(rows)):
+            st.dataframe(rows, use_container_width=True, hide_index=True,
+                         column_config={"CCR": st.column_config.NumberColumn("CCR", format="%.1f")})
 
 def footer():
     st.divider()
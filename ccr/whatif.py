@@ -0,0 +1,94 @@
+import os, threading
+import numpy as np
+import pandas as pd
+from .algorithm import DIMENSIONS, _normalize_weights, score_components
+from .storage import get_store
+
+def weight_vector(weights: dict) -> np.ndarray:
+    w = _normalize_weights(weights)
+    return np.array([w[d] for d in DIMENSIONS])
+
+class WhatIfEngine:
+    # Precomputes everything in the CCR pipeline that does not depend on the weights, so re-weighting
+    # the whole history is one (N x 12) @ (12,) product and a grid of G weight sets one (N x 12) @ (12 x G).
+    def __init__(self, df: pd.DataFrame):
+        self.scaled, self.boost, self.penalty = score_components(df)
+        ids = df["campaign_id"].astype(str) if "campaign_id" in df.columns else pd.Series([""] * len(df))
+        codes, self.campaigns = pd.factorize(ids, sort=True)
+        # ratings sorted by campaign, so per-campaign sums are a single np.add.reduceat
+        self._order = np.argsort(codes, kind="stable")
+        self._starts = np.flatnonzero(np.r_[True, np.diff(codes[self._order]) != 0]) if len(codes) else np.array([], dtype=int)
+        self.counts = np.bincount(codes, minlength=len(self.campaigns))
+        meta = [c for c in ("campaign_name", "brand", "channel", "scene_audience") if c in df.columns]
+        self.meta = df.assign(campaign_id=ids)[["campaign_id", *meta]].drop_duplicates("campaign_id", keep="last") \
+                      .set_index("campaign_id").reindex(pd.Index(self.campaigns, name="campaign_id"))
+
+    def __len__(self):
+        return len(self.scaled)
+
+    def scores(self, weights: dict) -> np.ndarray:
+        return np.clip((self.scaled @ weight_vector(weights)) * self.boost + self.penalty, 0.0, 100.0)
+
+    def scores_grid(self, weight_grid) -> np.ndarray:
+        # weight_grid: list of weight dicts or a (G x 12) array in DIMENSIONS order -> (N x G) scores
+        if isinstance(weight_grid, np.ndarray):
+            W = np.clip(weight_grid.astype(float), 0.0, None)
+            s = W.sum(axis=1, keepdims=True)
+            W = W / np.where(s > 0, s, 1.0)
+        else:
+            W = np.array([weight_vector(w) for w in weight_grid]).reshape(-1, len(DIMENSIONS))
+        return np.clip((self.scaled @ W.T) * self.boost[:, None] + self.penalty[:, None], 0.0, 100.0)
+
+    def campaign_means(self, scores: np.ndarray) -> np.ndarray:
+        # (N,) or (N x G) per-rating scores -> (C,) or (C x G) per-campaign means
+        if not len(scores):
+            return scores[:0]
+        sums = np.add.reduceat(scores[self._order], self._starts, axis=0)
+        return sums / (self.counts[:, None] if sums.ndim == 2 else self.counts)
+
+    def campaign_grid(self, weight_grid, block: int = 64) -> np.ndarray:
+        # (C x G) per-campaign means for a large grid, scored `block` weight sets at a time to bound memory
+        n = len(weight_grid)
+        out = np.empty((len(self.campaigns), n))
+        for i in range(0, n, block):
+            out[:, i:i + block] = self.campaign_means(self.scores_grid(weight_grid[i:i + block]))
+        return out
+
+    def ranks(self, weights: dict) -> np.ndarray:
+        # 1-based leaderboard position of every campaign, in self.campaigns order
+        ccr = self.campaign_means(self.scores(weights))
+        r = np.empty(len(ccr), dtype=int)
+        r[np.argsort(-ccr, kind="stable")] = np.arange(1, len(ccr) + 1)
+        return r
+
+    def leaderboard(self, weights: dict, top: int = None, baseline: dict = None) -> pd.DataFrame:
+        ccr = self.campaign_means(self.scores(weights))
+        if top is not None and top < len(ccr):
+            part = np.argpartition(-ccr, top)[:top]
+            order = part[np.argsort(-ccr[part], kind="stable")]
+        else:
+            order = np.argsort(-ccr, kind="stable")
+        out = self.meta.iloc[order].reset_index()
+        out.insert(0, "rank", np.arange(1, len(order) + 1))
+        out["n_ratings"] = self.counts[order]
+        out["CCR_mean"] = ccr[order]
+        if baseline is not None:
+            # positive = moved up compared with the baseline weights
+            out["rank_change"] = self.ranks(baseline)[order] - out["rank"].to_numpy()
+        return out
+
+_lock = threading.Lock()
+_engines = {}
+
+def engine(store=None) -> WhatIfEngine:
+    # one engine per store, rebuilt only when the underlying file/directory changes
+    store = store or get_store()
+    key, version = (store.name, os.path.abspath(store.path)), store.version()
+    with _lock:
+        hit = _engines.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+    eng = WhatIfEngine(store.load())
+    with _lock:
+        _engines[key] = (version, eng)
+    return eng
@@ -0,0 +1,37 @@
+import time
+import streamlit as st
+from ccr.algorithm import DIMENSIONS, LABELS, get_weights
+from ccr.whatif import engine, weight_vector
+
+st.set_page_config(page_title="What-if Weights", layout="wide")
+st.title("What-if Weights")
+st.markdown("Move the weights to see how the leaderboard of all rated campaigns would change. "
+            "Weights are renormalised to sum to 1, exactly as in the live score.")
+
+eng = engine()
+default_weights = get_weights()
+if not len(eng):
+    st.info("No evaluations saved yet.")
+    st.stop()
+
+for d in DIMENSIONS:
+    st.session_state.setdefault(f"whatif_{d}", float(default_weights[d]))
+if st.button("Reset to default weights"):
+    for d in DIMENSIONS:
+        st.session_state[f"whatif_{d}"] = float(default_weights[d])
+
+c_left, c_right = st.columns([1, 2])
+with c_left:
+    weights = {d: st.slider(LABELS[d][0], 0.0, 0.40, step=0.01, key=f"whatif_{d}") for d in DIMENSIONS}
+    top = st.number_input("Show top", min_value=5, max_value=500, value=25, step=5)
+
+with c_right:
+    t = time.perf_counter()
+    lb = eng.leaderboard(weights, top=int(top), baseline=default_weights)
+    ms = (time.perf_counter() - t) * 1e3
+    st.caption(f"Re-ranked {len(eng.campaigns):,} campaigns ({len(eng):,} ratings) in {ms:.1f} ms")
+    st.dataframe(lb, use_container_width=True, hide_index=True,
+                 column_config={"CCR_mean": st.column_config.NumberColumn("CCR", format="%.1f"),
+                                "rank_change": st.column_config.NumberColumn("vs default", format="%+d")})
+    st.markdown("**Normalised weights**")
+    st.bar_chart(dict(zip([LABELS[d][0] for d in DIMENSIONS], weight_vector(weights))))
@@ -0,0 +1,35 @@
+import streamlit as st
+from ccr.algorithm import LABELS
+from ccr.reliability import engine
+
+st.set_page_config(page_title="Rater Reliability", layout="wide")
+st.title("Rater Reliability")
+st.markdown("How consistently do raters score the same campaign? Agreement is computed per dimension over every "
+            "campaign rated by two or more raters. Values near 1 mean strong agreement; 0 means no better than chance.")
+
+eng = engine()
+if not len(eng):
+    st.info("No evaluations saved yet.")
+    st.stop()
+
+agr = eng.agreement()
+agr.insert(0, "Dimension", [LABELS[m][0] if m in LABELS else m for m in agr["measure"]])
+st.header("Agreement per dimension")
+st.caption(f"{len(eng):,} ratings, {len(eng.campaigns):,} campaigns, {len(eng.raters):,} raters")
+st.dataframe(agr.drop(columns="measure"), use_container_width=True, hide_index=True,
+             column_config={"krippendorff_alpha": st.column_config.NumberColumn("Krippendorff's α", format="%.3f"),
+                            "icc1": st.column_config.NumberColumn("ICC(1)", format="%.3f")})
+
+st.header("Rater leniency")
+st.markdown("Average deviation of each rater from the other raters of the same campaign (CCR points for the overall score, "
+            "1–5 points per dimension). Positive means more lenient than the consensus.")
+len_df = eng.leniency()
+st.dataframe(len_df, use_container_width=True, hide_index=True,
+             column_config={"CCR_offset": st.column_config.NumberColumn("CCR offset", format="%+.2f")})
+
+st.header("Rater-normalised CCR")
+top = st.number_input("Show top", min_value=10, max_value=1000, value=50, step=10)
+st.dataframe(eng.normalized_ccr().head(int(top)), use_container_width=True, hide_index=True,
+             column_config={"CCR_mean": st.column_config.NumberColumn("CCR", format="%.1f"),
+                            "CCR_normalized": st.column_config.NumberColumn("CCR (normalised)", format="%.1f"),
+                            "shift": st.column_config.NumberColumn("Shift", format="%+.1f")})
@@ -0,0 +1,46 @@
+import pandas as pd
+import streamlit as st
+from ccr import perf
+
+st.set_page_config(page_title="Performance", layout="wide")
+st.title("Performance")
+
+if not perf.ENABLED:
+    st.info("Profiling is off. Start the app with `CCR_PROFILE=1 streamlit run app.py` "
+            "(or `CCR_PROFILE=alloc` to also track memory allocated per stage).")
+
+records = perf.read_log()
+if not records:
+    st.caption(f"No reruns recorded yet in `{perf.LOG_PATH}`.")
+    st.stop()
+
+st.caption(f"{len(records):,} reruns recorded in `{perf.LOG_PATH}`")
+last = st.number_input("Use last N reruns", min_value=1, max_value=len(records), value=min(len(records), 500), step=10)
+records = records[-int(last):]
+
+st.header("Slowest stages")
+summ = perf.summary(records)
+ms = st.column_config.NumberColumn(format="%.1f")
+st.dataframe(summ, use_container_width=True, hide_index=True,
+             column_config={c: ms for c in ["mean_ms", "p50_ms", "p95_ms", "max_ms"]})
+st.bar_chart(summ[summ["stage"] != "(rerun total)"].head(15).set_index("stage")["p95_ms"])
+
+if perf.ALLOC:
+    allocs = pd.DataFrame([(s["name"], s["alloc_kb"]) for r in records for s in r["spans"] if "alloc_kb" in s],
+                          columns=["stage", "alloc_kb"])
+    if len(allocs):
+        st.header("Net allocation per stage (KiB)")
+        st.dataframe(allocs.groupby("stage")["alloc_kb"].agg(["count", "mean", "max"]).sort_values("max", ascending=False),
+                     use_container_width=True)
+
+st.header("CSV parse cost vs dataset size")
+st.markdown("Full parses of the ratings CSV (cache misses). Tail parses only read the rows appended since the last load.")
+parses = pd.DataFrame(perf.spans_named(records, "csv_parse"))
+if len(parses) and "rows" in parses:
+    st.scatter_chart(parses, x="rows", y="ms")
+else:
+    st.caption("No full CSV parses recorded.")
+loads = pd.DataFrame(perf.spans_named(records, "load_ratings"))
+if len(loads) and "rows" in loads:
+    st.markdown("**load_ratings** (all backends, including cache hits)")
+    st.scatter_chart(loads, x="rows", y="ms", color="backend" if "backend" in loads else None)
@@ -0,0 +1,51 @@
+import time
+from datetime import date
+import streamlit as st
+from ccr.leaderboard import ALL, engine, quarter
+
+st.set_page_config(page_title="Leaderboard", layout="wide")
+st.title("Leaderboard")
+st.markdown("Top campaigns by mean CCR for any combination of channel, audience, brand and quarter. "
+            "Leaderboards are kept up to date on every save, so no query rescans the ratings.")
+
+idx = engine()
+if not len(idx):
+    st.info("No evaluations saved yet.")
+    st.stop()
+
+def _all(v):
+    return "All" if v == ALL else (v or "(none)")
+
+c1, c2, c3, c4, c5 = st.columns([2, 2, 2, 2, 1])
+channel = c1.selectbox("Channel", [ALL, *sorted(idx.values["channel"])], format_func=_all, key="lb_channel")
+audience = c2.selectbox("Audience", [ALL, *sorted(idx.values["scene_audience"])], format_func=_all, key="lb_audience")
+brand = c3.selectbox("Brand", [ALL, *sorted(idx.values["brand"])], format_func=_all, key="lb_brand")
+periods = sorted((p for p in idx.values["period"] if p), reverse=True)
+this_quarter = quarter(str(date.today()))
+default = periods.index(this_quarter) + 1 if this_quarter in periods else 0
+period = c4.selectbox("Quarter", [ALL, *periods], index=default, format_func=lambda p: "All time" if p == ALL else p,
+                      key="lb_period")
+top = c5.number_input("Top", min_value=5, max_value=500, value=20, step=5, key="lb_top")
+
+q = dict(channel=channel, scene_audience=audience, brand=brand, period=period)
+t = time.perf_counter()
+lb = idx.top(int(top), **q)
+ms = (time.perf_counter() - t) * 1e3
+st.caption(f"{len(idx.board(**q)):,} campaigns in this selection, {len(idx):,} ratings indexed; answered in {ms:.2f} ms")
+if lb.empty:
+    st.info("No campaigns rated for this selection.")
+else:
+    st.dataframe(lb, use_container_width=True, hide_index=True,
+                 column_config={"CCR_mean": st.column_config.NumberColumn("CCR", format="%.1f")})
+
+st.header("Where does a campaign stand?")
+cid = st.text_input("Campaign ID", key="lb_campaign").strip()
+if cid:
+    r = idx.rank(cid, **q)
+    if r is None:
+        st.info(f"{cid} has no ratings in this selection.")
+    else:
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Rank", f"{r['rank']:,} of {r['of']:,}")
+        m2.metric("Percentile", f"{r['percentile']:.0f}")
+        m3.metric("CCR", f"{r['CCR_mean']:.1f}")
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ccr.algorithm import DIMENSIONS, FLAG_COLS, BASE_WEIGHTS, compute_ccr_batch, compute_ccr_single
+
+def _ratings(n, seed=0, off_grid=False):
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(1.0, 5.0, (n, len(DIMENSIONS))) if off_grid else rng.integers(2, 11, (n, len(DIMENSIONS))) / 2.0
+    df = pd.DataFrame(scores, columns=DIMENSIONS)
+    for c in FLAG_COLS[:-1]:
+        df[c] = (rng.random(n) < 0.3).astype(int)
+    df[FLAG_COLS[-1]] = np.round(rng.random(n), 2)
+    return df
+
+def _single(df, weights):
+    return np.array([compute_ccr_single(r, weights, r) for r in df.to_dict("records")])
+
+WEIGHT_SETS = [BASE_WEIGHTS, {d: i + 1.0 for i, d in enumerate(DIMENSIONS)}, {**{d: 0.0 for d in DIMENSIONS}, "CR_cultural_resonance": 1.0}]
+
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+@pytest.mark.parametrize("off_grid", [False, True])
+def test_batch_is_bit_identical_to_single(weights, off_grid):
+    df = _ratings(5000, seed=1, off_grid=off_grid)
+    np.testing.assert_array_equal(compute_ccr_batch(df, weights), _single(df, weights))
+
+def test_array_inputs_match_dataframe():
+    df = _ratings(500, seed=2)
+    got = compute_ccr_batch(df[DIMENSIONS].to_numpy(), BASE_WEIGHTS, df[FLAG_COLS].to_numpy())
+    np.testing.assert_array_equal(got, compute_ccr_batch(df, BASE_WEIGHTS))
+
+def test_missing_and_bad_values_follow_single_path():
+    df = _ratings(50, seed=3).astype(object)
+    df = df.drop(columns=["CC_cultural_contribution"])  # missing dimension -> 3.0, like .get(d, 3.0)
+    df.loc[0, "OR_originality"] = "n/a"
+    df.loc[1, "TI_timeliness"] = None
+    np.testing.assert_array_equal(compute_ccr_batch(df, BASE_WEIGHTS), _single(df, BASE_WEIGHTS))
+
+def test_extremes_are_clipped():
+    lo = pd.DataFrame([{**{d: 1.0 for d in DIMENSIONS}, **{c: 1 for c in FLAG_COLS}}])
+    hi = pd.DataFrame([{d: 5.0 for d in DIMENSIONS}])
+    assert compute_ccr_batch(lo, BASE_WEIGHTS)[0] == 0.0
+    assert compute_ccr_batch(hi, BASE_WEIGHTS)[0] <= 100.0
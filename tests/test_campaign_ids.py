@@ -0,0 +1,50 @@
+import multiprocessing as mp, os
+import pytest
+from ccr import data_io, storage
+from ccr.storage import CsvStore
+
+WORKERS, IDS = 4, 100
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(data_io.__file__))), "app.py")
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s = CsvStore(str(tmp_path / "ratings.csv"))
+    monkeypatch.setattr(storage, "_store", s)
+    return s
+
+def _allocate(seq, out):
+    out.put([data_io.next_campaign_id(path=seq) for _ in range(IDS)])
+
+def test_parallel_processes_never_share_an_id(store, tmp_path):
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    seq, out = str(tmp_path / "seq"), ctx.Queue()
+    procs = [ctx.Process(target=_allocate, args=(seq, out)) for _ in range(WORKERS)]
+    for p in procs: p.start()
+    ids = [i for _ in procs for i in out.get(timeout=60)]
+    for p in procs: p.join(60)
+    assert len(ids) == len(set(ids)) == WORKERS * IDS
+    assert sorted(ids) == [f"CMP{n:03d}" for n in range(1, WORKERS * IDS + 1)]
+
+def test_seeded_from_the_highest_existing_id(store, tmp_path):
+    store.append([{"campaign_id": "CMP041"}, {"campaign_id": "CMP007"}, {"campaign_id": "legacy"}])
+    seq = str(tmp_path / "seq")
+    assert data_io.next_campaign_id(path=seq) == "CMP042"
+    store.append([{"campaign_id": "CMP900"}])  # the counter is seeded once, not rescanned
+    assert data_io.next_campaign_id(path=seq) == "CMP043"
+
+def test_peek_does_not_take_an_id(store, tmp_path):
+    store.append([{"campaign_id": "CMP009"}])
+    seq = str(tmp_path / "seq")
+    assert [data_io.peek_campaign_id(path=seq) for _ in range(3)] == ["CMP010"] * 3
+    assert data_io.next_campaign_id(path=seq) == "CMP010"
+    assert data_io.peek_campaign_id(path=seq) == "CMP011"
+
+def test_opening_the_app_takes_no_id(store, tmp_path):
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+    (tmp_path / "data").mkdir()
+    for _ in range(3):  # three fresh browser sessions that never save
+        at = AppTest.from_file(APP, default_timeout=60).run()
+        assert not at.exception and at.session_state.info["campaign_id"] == "CMP001"
+    assert data_io.next_campaign_id() == "CMP001"
@@ -0,0 +1,56 @@
+import itertools
+import numpy as np
+import pytest
+from ccr.core import (BASE_WEIGHTS, DIMENSIONS, FLAG_COLS, SCORE_STEPS, SENTIMENT_STEPS, CompiledScorer,
+                      compute_ccr_single)
+
+WEIGHT_SETS = [BASE_WEIGHTS, {d: i + 1.0 for i, d in enumerate(DIMENSIONS)}]
+
+def _check(scorer, weights, scores, flags):
+    assert scorer(scores, flags) == compute_ccr_single(scores, weights, flags), (scores, flags)
+
+# The full cross product (9^12 score vectors x 16 flag sets x 101 ratios) is out of reach, so every table
+# entry is covered exhaustively instead: each dimension at each step, every flag combination with every
+# sentiment step, plus a large random sample of complete grid points.
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+def test_every_score_step_of_every_dimension(weights):
+    scorer = CompiledScorer(weights)
+    for d, v, base in itertools.product(DIMENSIONS, SCORE_STEPS, SCORE_STEPS):
+        _check(scorer, weights, {**{x: base for x in DIMENSIONS}, d: v}, {})
+
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+def test_every_flag_and_sentiment_combination(weights):
+    scorer = CompiledScorer(weights)
+    scores = {d: 4.0 for d in DIMENSIONS}
+    for bits in itertools.product((0, 1), repeat=4):
+        for r in SENTIMENT_STEPS:
+            _check(scorer, weights, scores, {**dict(zip(FLAG_COLS[:4], bits)), FLAG_COLS[4]: r})
+
+@pytest.mark.parametrize("weights", WEIGHT_SETS)
+def test_random_grid_points(weights):
+    rng = np.random.default_rng(0)
+    scorer = CompiledScorer(weights, memo_size=64)
+    steps, ratios = np.array(SCORE_STEPS), np.array(SENTIMENT_STEPS)
+    for _ in range(5_000):
+        scores = dict(zip(DIMENSIONS, rng.choice(steps, len(DIMENSIONS)).tolist()))
+        flags = {**dict(zip(FLAG_COLS[:4], rng.integers(0, 2, 4).tolist())), FLAG_COLS[4]: float(rng.choice(ratios))}
+        _check(scorer, weights, scores, flags)
+
+def test_off_grid_and_odd_inputs_fall_back():
+    scorer = CompiledScorer(BASE_WEIGHTS)
+    for scores, flags in [({"CR_cultural_resonance": 3.3}, {}), ({}, {"neg_sentiment_ratio_estimate": 0.123}),
+                          ({"OR_originality": "4.5"}, {"flag_stereotype": "1"}), ({"SH_shareability": [1]}, {})]:
+        try:
+            want = compute_ccr_single(scores, BASE_WEIGHTS, flags)
+        except Exception as e:
+            with pytest.raises(type(e)):
+                scorer(scores, flags)
+        else:
+            got = scorer(scores, flags)
+            assert got == want or (np.isnan(got) and np.isnan(want))
+
+def test_memo_is_used():
+    scorer = CompiledScorer(BASE_WEIGHTS)
+    scores = {d: 3.5 for d in DIMENSIONS}
+    scorer(scores, {}); scorer(scores, {})
+    assert scorer.cache_info().hits == 1
@@ -0,0 +1,48 @@
+import multiprocessing as mp
+import pandas as pd
+import pytest
+from ccr.storage import RATING_COLUMNS, CsvStore, SqliteStore
+
+WORKERS, ROWS = 4, 150
+# long, quoted, comma- and newline-containing notes make torn or interleaved writes visible
+NOTE = 'says "hi", then\nwrites a long note ' + "x" * 2000
+
+def _row(w, i):
+    return {**{c: None for c in RATING_COLUMNS}, "campaign_id": f"W{w}", "rater_id": f"R{i}",
+            "rater_notes": f"{w}:{i} {NOTE}", "CR_cultural_resonance": 1.0 + (i % 9) / 2}
+
+def _writer(kind, path, w):
+    store = (CsvStore if kind == "csv" else SqliteStore)(path)
+    for i in range(ROWS):
+        store.append([_row(w, i)])
+
+def _ctx():
+    return mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+
+@pytest.mark.parametrize("kind", ["csv", "sqlite"])
+def test_parallel_appends_lose_and_tear_nothing(tmp_path, kind):
+    path = str(tmp_path / f"ratings.{kind}")
+    store = (CsvStore if kind == "csv" else SqliteStore)(path)
+    store.ensure()
+    procs = [_ctx().Process(target=_writer, args=(kind, path, w)) for w in range(WORKERS)]
+    for p in procs: p.start()
+    for p in procs: p.join(60)
+    assert all(p.exitcode == 0 for p in procs)
+
+    df = pd.read_csv(path, dtype=str) if kind == "csv" else store.load()
+    assert list(df.columns) == RATING_COLUMNS
+    assert len(df) == WORKERS * ROWS
+    got = {(r.campaign_id, r.rater_id) for r in df.itertuples()}
+    assert got == {(f"W{w}", f"R{i}") for w in range(WORKERS) for i in range(ROWS)}
+    for r in df.itertuples():
+        w, i = int(r.campaign_id[1:]), int(r.rater_id[1:])
+        assert r.rater_notes == f"{w}:{i} {NOTE}"
+        assert float(r.CR_cultural_resonance) == 1.0 + (i % 9) / 2
+
+def test_header_is_kept_when_appending_to_an_existing_file(tmp_path):
+    path = tmp_path / "ratings.csv"
+    cols = RATING_COLUMNS[::-1]  # an older file with a different column order
+    path.write_text(",".join(cols) + "\n")
+    CsvStore(str(path)).append([_row(0, 0)])
+    df = pd.read_csv(path, dtype=str)
+    assert list(df.columns) == cols and df.loc[0, "campaign_id"] == "W0"
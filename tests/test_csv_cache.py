@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+from ccr.algorithm import DIMENSIONS, FLAG_COLS
+from ccr.storage import CsvStore, csv_cache
+
+SCORES = {**{d: 3.0 for d in DIMENSIONS}, **{c: 0 for c in FLAG_COLS}}
+
+def _cold(store):
+    csv_cache.invalidate(store.path)
+    return store.load()
+
+@pytest.mark.parametrize("rows", [
+    [{"campaign_id": "CMP001", "rater_id": "1", **SCORES}, {"campaign_id": "007", "rater_id": "02", **SCORES}],
+    [{"campaign_id": "CMP001", "flag_stereotype": 0}, {"campaign_id": "007"}],  # tail does not fit the cached dtypes
+    [{"campaign_id": "1"}, {"campaign_id": "2.50", "rater_notes": "3"}],
+])
+def test_tail_extended_load_matches_a_cold_parse(tmp_path, rows):
+    store = CsvStore(str(tmp_path / "r.csv"))
+    for row in rows:
+        store.append([row])
+        warm = store.load()
+        pd.testing.assert_frame_equal(warm, _cold(store))
+    assert warm["campaign_id"].tolist() == [r["campaign_id"] for r in rows]
+    assert store.count(campaign_id=rows[-1]["campaign_id"]) == 1
+
+def test_appends_are_tail_parsed(tmp_path):
+    store = CsvStore(str(tmp_path / "r.csv"))
+    store.append([{"campaign_id": "CMP001", **SCORES}])
+    store.load()
+    before = csv_cache.tail_parses
+    store.append([{"campaign_id": "007", **SCORES}])
+    assert store.load()["campaign_id"].tolist() == ["CMP001", "007"]
+    assert csv_cache.tail_parses == before + 1
@@ -0,0 +1,23 @@
+import os, subprocess, sys
+from ccr.bench import import_time_ms
+
+# cold-start budget for the NumPy-only scoring core (numpy itself is most of it)
+CORE_IMPORT_BUDGET_MS = 250.0
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(code, cwd):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True).stdout
+
+def test_core_cold_import_within_budget():
+    ms = import_time_ms("ccr.core")
+    assert ms <= CORE_IMPORT_BUDGET_MS, f"import ccr.core took {ms:.0f} ms (budget {CORE_IMPORT_BUDGET_MS:.0f} ms)"
+
+def test_core_imports_neither_pandas_nor_streamlit(tmp_path):
+    out = _run("import sys, ccr.core; print(sorted(m for m in ('pandas', 'streamlit') if m in sys.modules))", tmp_path)
+    assert out.strip() == "[]"
+
+def test_imports_do_no_file_io(tmp_path):
+    # importing must not create data/ or anything else in the working directory
+    _run("import ccr.core, ccr.algorithm, ccr.data_io, ccr.storage", tmp_path)
+    assert os.listdir(tmp_path) == []
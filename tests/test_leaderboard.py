@@ -0,0 +1,72 @@
+import threading
+import pytest
+from ccr import data_io, leaderboard, storage
+from ccr.algorithm import DIMENSIONS, FLAG_COLS
+from ccr.storage import make_store
+
+def _row(i, cid=None):
+    return {"campaign_id": cid or f"CMP{i % 7:03d}", "rater_id": f"R{i % 3}", "brand": "b", "channel": "TikTok",
+            "scene_audience": "a", "submit_date_iso": f"2025-0{i % 9 + 1}-15",
+            **{d: 1.0 + (i * 7 + j) % 9 / 2 for j, d in enumerate(DIMENSIONS)}, **{c: 0 for c in FLAG_COLS}}
+
+@pytest.fixture(params=["csv", "sqlite", "parquet"])
+def store(request, tmp_path, monkeypatch):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    s = make_store(request.param, data_dir=str(tmp_path))
+    monkeypatch.setattr(storage, "_store", s)
+    monkeypatch.setattr(leaderboard, "_indexes", {})
+    s.append([_row(i) for i in range(40)])
+    return s
+
+def test_save_updates_the_index_without_a_reload(store, monkeypatch):
+    idx = leaderboard.engine(store)
+    assert leaderboard.engine(store) is idx
+    loads = []
+    real = store.load
+    monkeypatch.setattr(store, "load", lambda *a, **k: loads.append(1) or real(*a, **k))
+    for i in range(3):
+        data_io.save_rating(_row(100 + i, cid="NEW"))
+    new = leaderboard.engine(store)
+    assert not loads
+    assert len(new) == 43 and new.rank("NEW")["of"] == 8
+    assert len(idx) == 40 and idx.rank("NEW") is None  # the index handed out earlier is left as it was
+
+def test_readers_see_consistent_snapshots_while_saving(store):
+    idx = leaderboard.engine(store)
+    expected = idx.top(50)
+    errors, done = [], threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                snap = leaderboard.engine(store)
+                for a in leaderboard.SLICE_ATTRS:
+                    sorted(snap.values[a])
+                top = snap.top(50)
+                assert len(top) == len(snap.board())
+                for cid in top["campaign_id"]:
+                    assert snap.rank(cid)["CCR_mean"] == pytest.approx(top.loc[top["campaign_id"] == cid, "CCR_mean"].iloc[0])
+            except Exception as e:
+                errors.append(e); return
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for t in readers: t.start()
+    for i in range(30):
+        data_io.save_rating(_row(300 + i, cid=f"T{i % 11}"))
+    done.set()
+    for t in readers: t.join()
+    assert not errors
+    assert idx.top(50).equals(expected)
+    assert len(leaderboard.engine(store)) == 70
+
+def test_index_matches_a_full_scan(store):
+    for i in range(5):
+        data_io.save_rating(_row(200 + i))
+    idx = leaderboard.engine(store)
+    fresh = leaderboard.LeaderboardIndex(idx.weights).add(store.load())
+    for q in [{}, {"period": "2025-Q1"}, {"channel": "TikTok", "period": "2025-Q3"}]:
+        assert idx.top(50, **q).equals(fresh.top(50, **q))
+        scan = idx.scan_top(store.load(), 50, **q)
+        assert list(idx.top(50, **q)["CCR_mean"]) == pytest.approx(list(scan))
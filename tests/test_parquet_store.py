@@ -0,0 +1,36 @@
+import multiprocessing as mp
+import pytest
+from ccr.storage import RATING_COLUMNS, ParquetStore
+
+pytest.importorskip("pyarrow")
+
+def _row(w, i):
+    return {**{c: None for c in RATING_COLUMNS}, "campaign_id": f"W{w}", "rater_id": f"R{i}", "brand": "b",
+            "submit_date_iso": f"2025-01-{i % 28 + 1:02d}", "CR_cultural_resonance": 1.0 + (i % 9) / 2}
+
+class SmallStore(ParquetStore):
+    COMPACT_AFTER = 6
+
+def _writer(path, w, n):
+    store = SmallStore(path)
+    for i in range(n):
+        store.append([_row(w, i)])
+
+def test_part_count_stays_bounded(tmp_path):
+    store = SmallStore(str(tmp_path / "r.parquet"))
+    for i in range(100):
+        store.append([_row(0, i)])
+        assert len(store._parts()) < SmallStore.COMPACT_AFTER
+    df = store.load()
+    assert sorted(df["rater_id"]) == sorted(f"R{i}" for i in range(100))
+    assert store.count(brand="b") == 100
+
+def test_compaction_under_concurrent_appends(tmp_path):
+    path = str(tmp_path / "r.parquet")
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    procs = [ctx.Process(target=_writer, args=(path, w, 40)) for w in range(3)]
+    for p in procs: p.start()
+    for p in procs: p.join(120)
+    assert all(p.exitcode == 0 for p in procs)
+    df = SmallStore(path).load()
+    assert sorted(zip(df["campaign_id"], df["rater_id"])) == sorted((f"W{w}", f"R{i}") for w in range(3) for i in range(40))
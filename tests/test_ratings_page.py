@@ -0,0 +1,21 @@
+import pytest
+from ccr import data_io, storage
+from ccr.storage import CsvStore
+
+# insertion order is deliberately not chronological, as after an import or a parquet compaction
+DATES = ["2025-03-01", "2024-12-31", "2025-06-30", "2025-03-01", None, "2025-01-15"]
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = CsvStore(str(tmp_path / "r.csv"))
+    monkeypatch.setattr(storage, "_store", s)
+    s.append([{"campaign_id": f"C{i}", "submit_date_iso": d} for i, d in enumerate(DATES)])
+    return s
+
+def test_newest_and_oldest_sort_by_date_then_row_order(store):
+    assert data_io.ratings_page(1, 10, "oldest")["campaign_id"].tolist() == ["C4", "C1", "C5", "C0", "C3", "C2"]
+    assert data_io.ratings_page(1, 10, "newest")["campaign_id"].tolist() == ["C2", "C3", "C0", "C5", "C1", "C4"]
+
+def test_pages_follow_the_date_order(store):
+    pages = [data_io.ratings_page(p, 4, "newest")["campaign_id"].tolist() for p in (1, 2, 3)]
+    assert pages == [["C2", "C3", "C0", "C5"], ["C1", "C4"], []]
@@ -0,0 +1,58 @@
+import os
+import pandas as pd
+import pytest
+from ccr import data_io, results, storage
+from ccr.algorithm import DIMENSIONS, FLAG_COLS
+from ccr.storage import make_store
+
+def _row(i, cid=None):
+    return {"campaign_id": cid or f"CMP{i % 5:03d}", "rater_id": f"R{i % 3}", "brand": f"B{i % 2}", "channel": "TV",
+            "submit_date_iso": "2025-03-01", **{d: 1.0 + (i + j) % 9 / 2 for j, d in enumerate(DIMENSIONS)},
+            **{c: i % 2 for c in FLAG_COLS}}
+
+@pytest.fixture(params=["csv", "sqlite"])
+def store(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    s = make_store(request.param)
+    monkeypatch.setattr(storage, "_store", s)
+    s.append([_row(i) for i in range(20)])
+    return s
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    calls = []
+    real = results.aggregate
+    monkeypatch.setattr(results, "aggregate", lambda *a, **k: calls.append(1) or real(*a, **k))
+    return calls
+
+def test_built_once_on_first_use_then_updated_per_save(store, rebuilds):
+    assert not os.path.exists(data_io.RESULTS_DB)
+    assert len(data_io.load_results()) == 5 and len(rebuilds) == 1
+    for i in range(6):
+        data_io.save_rating(_row(100 + i, cid="NEW" if i % 2 else None))
+        res = data_io.load_results()
+    assert len(rebuilds) == 1
+    assert len(res) == 6 and res["n_ratings"].sum() == 26
+    assert results.is_current(data_io.RESULTS_DB)
+    assert results.check(data_io.RESULTS_DB) == []
+    results._cache.clear()  # saves patch the cached frame; it must match what is on disk
+    pd.testing.assert_frame_equal(res, results.load(data_io.RESULTS_DB))
+
+def test_rebuilt_when_ratings_bypass_save_rating(store, rebuilds):
+    data_io.load_results()
+    store.append([_row(7, cid="IMPORTED")])  # e.g. a bulk import
+    assert not results.is_current(data_io.RESULTS_DB)
+    data_io.save_rating(_row(8))  # the table is behind, so the save leaves it to the next read
+    res = data_io.load_results()
+    assert len(rebuilds) == 2 and "IMPORTED" in set(res["campaign_id"])
+    assert results.check(data_io.RESULTS_DB) == []
+
+def test_legacy_results_csv_is_never_written(store):
+    legacy = os.path.join("data", "CCR_results.csv")
+    with open(legacy, "w") as f:
+        f.write("campaign_id,CCR_mean\nold,50\n")
+    data_io.load_results()
+    data_io.save_rating(_row(1))
+    with open(legacy) as f:
+        assert f.read() == "campaign_id,CCR_mean\nold,50\n"
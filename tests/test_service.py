@@ -0,0 +1,58 @@
+import asyncio, json
+import pytest
+from ccr.core import BASE_WEIGHTS, DIMENSIONS, compute_ccr_single
+from ccr.service import MAX_HEADER, Scorer, Service
+
+REC = {**{d: 1.0 + i % 9 / 2 for i, d in enumerate(DIMENSIONS)}, "flag_stereotype": 1, "neg_sentiment_ratio_estimate": 0.2}
+
+async def _exchange(port, raw: bytes):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw); await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int([l for l in head.decode().split("\r\n") if l.lower().startswith("content-length")][0].split(":")[1])
+    body = await reader.readexactly(length)
+    writer.close()
+    return int(head.split(b" ")[1]), json.loads(body)
+
+def _request(method, path, body=None, length=None):
+    data = b"" if body is None else json.dumps(body).encode()
+    return (f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data) if length is None else length}\r\n"
+            "Connection: close\r\n\r\n").encode() + data
+
+def _run(*raws):
+    async def main():
+        scorer = Scorer(weights_path="/nonexistent/weights.json", max_wait_ms=1.0)  # falls back to BASE_WEIGHTS
+        batcher = asyncio.create_task(scorer.run())
+        server = await asyncio.start_server(Service(scorer).handle, "127.0.0.1", 0, limit=MAX_HEADER)
+        try:
+            port = server.sockets[0].getsockname()[1]
+            return [await _exchange(port, r) for r in raws]
+        finally:
+            server.close(); batcher.cancel()
+    return asyncio.run(main())
+
+def test_score_and_batch_match_the_scalar_scorer():
+    want = compute_ccr_single(REC, BASE_WEIGHTS, REC)
+    (s1, one), (s2, nested), (s3, batch), (s4, bare) = _run(
+        _request("POST", "/score", REC),
+        _request("POST", "/score", {"scores": {d: REC[d] for d in DIMENSIONS}, "flags": {"flag_stereotype": 1, "neg_sentiment_ratio_estimate": 0.2}}),
+        _request("POST", "/score/batch", {"records": [REC, {}]}),
+        _request("POST", "/score/batch", [REC]))
+    assert (s1, s2, s3, s4) == (200, 200, 200, 200)
+    assert one["ccr"] == pytest.approx(want) and nested["ccr"] == pytest.approx(want)
+    assert batch["ccr"][0] == pytest.approx(want) and len(batch["ccr"]) == 2 and bare["ccr"] == [pytest.approx(want)]
+
+@pytest.mark.parametrize("body", [{"scores": [1, 2]}, {"flags": "x"}, [1], "text"])
+def test_malformed_records_are_a_400(body):
+    for status, out in _run(_request("POST", "/score", body), _request("POST", "/score/batch", {"records": [body]})):
+        assert status == 400 and "error" in out
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3", "²"])
+def test_invalid_content_length_is_a_400(length):
+    raw = _request("POST", "/score", REC).replace(f"Content-Length: {len(json.dumps(REC))}".encode(), f"Content-Length: {length}".encode("latin-1"))
+    [(status, out)] = _run(raw)
+    assert status == 400 and "Content-Length" in out["error"]
+
+def test_routes():
+    (s1, health), (s2, _), (s3, _) = _run(_request("GET", "/health"), _request("GET", "/nope"), _request("GET", "/score"))
+    assert (s1, s2, s3) == (200, 404, 405) and health["status"] == "ok"